@@ -1,54 +1,12 @@
-from fastapi import FastAPI, HTTPException
-from pymongo import MongoClient
-from pydantic import BaseModel, EmailStr
-from datetime import datetime, timedelta
 import os
-import bcrypt
-import jwt
+import sys
 
-app = FastAPI()
+# The shared app package lives with the Railway backend (bundled via vercel.json includeFiles)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
 
-# MongoDB connection
-MONGO_URL = os.getenv("MONGODB_URI", "mongodb://localhost:27017/habitmaster")
-client = MongoClient(MONGO_URL)
-db = client.habitmaster
+from habitmaster.app import function_app
 
-# JWT settings
-JWT_SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key")
-JWT_ALGORITHM = "HS256"
-JWT_EXPIRE_MINUTES = 30
+# Loads only the auth router
+app = function_app("auth", "/login")
 
-class UserLogin(BaseModel):
-    email: EmailStr
-    password: str
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-
-def create_access_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
-    return encoded_jwt
-
-@app.post("/")
-async def login_user(user: UserLogin):
-    # Find user
-    db_user = db.users.find_one({"email": user.email})
-    if not db_user or not verify_password(user.password, db_user["password"]):
-        raise HTTPException(status_code=401, detail="Invalid email or password")
-    
-    # Create access token
-    access_token = create_access_token(data={"sub": user.email})
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": {
-            "id": db_user["id"],
-            "username": db_user["username"],
-            "email": db_user["email"]
-        }
-    }
-
-handler = app
\ No newline at end of file
+handler = app
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The shared app package lives with the Railway backend (bundled via vercel.json includeFiles)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from habitmaster.app import function_app
+
+# Loads only the refresh router - no bcrypt
+app = function_app("refresh", "/refresh")
+
+handler = app
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# The shared app package lives with the Railway backend (bundled via vercel.json includeFiles)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend"))
+
+from habitmaster.app import function_app
+
+# The only function that needs NumPy; it installs api/reports/requirements.txt instead of the root one
+app = function_app("stats", "/reports/heatmap")
+
+handler = app
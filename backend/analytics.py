@@ -0,0 +1,135 @@
+"""Streaks and rolling completion rates, maintained incrementally.
+
+Each habit carries a small ``stats`` document updated on every completion:
+
+    {"current_streak": 4, "longest_streak": 9, "total": 57,
+     "last_day": "2024-05-02", "window": <int>}
+
+``window`` holds the last WINDOW_DAYS days as bits, bit ``i`` set when the
+habit was completed ``i`` days before ``last_day``. A completion shifts the
+window and sets bit 0, and reading rates "as of today" shifts it again, so
+both writes and reads are O(1) whatever the length of the history.
+"""
+from datetime import date
+from typing import Iterable, Optional
+
+from completions import DAY_FORMAT, DayLike, all_completed_days
+
+WINDOW_DAYS = 30
+WINDOW_MASK = (1 << WINDOW_DAYS) - 1
+RATE_WINDOWS = (7, 30)
+
+# What a rebuild needs to read
+HISTORY_FIELDS = {"_id": 0, "id": 1, "completions": 1, "completed_dates": 1}
+
+
+def _ordinal(day: DayLike) -> int:
+    if isinstance(day, str):
+        return date.fromisoformat(day).toordinal()
+    return day.toordinal()
+
+
+def _key(day: DayLike) -> str:
+    return day if isinstance(day, str) else day.strftime(DAY_FORMAT)
+
+
+def empty_stats() -> dict:
+    return {"current_streak": 0, "longest_streak": 0, "total": 0, "last_day": None, "window": 0}
+
+
+def record_completion(stats: Optional[dict], day: DayLike) -> Optional[dict]:
+    """Stats after a completion on ``day``.
+
+    Returns None when ``day`` is earlier than the last recorded completion;
+    callers rebuild from the full history in that case.
+    """
+    stats = stats or empty_stats()
+    if stats.get("last_day") is None:
+        return {"current_streak": 1, "longest_streak": 1, "total": 1, "last_day": _key(day), "window": 1}
+
+    gap = _ordinal(day) - _ordinal(stats["last_day"])
+    if gap < 0:
+        return None
+    if gap == 0:
+        return stats
+
+    current = stats["current_streak"] + 1 if gap == 1 else 1
+    window = ((stats["window"] << gap) | 1) & WINDOW_MASK if gap < WINDOW_DAYS else 1
+    return {
+        "current_streak": current,
+        "longest_streak": max(stats["longest_streak"], current),
+        "total": stats["total"] + 1,
+        "last_day": _key(day),
+        "window": window,
+    }
+
+
+def stats_from_days(days: Iterable[DayLike]) -> dict:
+    """Rebuild stats from a complete, ascending list of completion days."""
+    stats = empty_stats()
+    for day in days:
+        stats = record_completion(stats, day)
+    return stats
+
+
+def stats_write(previous: Optional[dict], day: DayLike) -> Optional[tuple]:
+    """``(filter, update)`` recording ``day`` on top of ``previous``, or None when a rebuild is needed.
+
+    The filter pins ``stats.last_day`` so a concurrent update makes the write
+    match nothing instead of clobbering it. Habits without stats (written
+    before this module) are rebuilt from their history on first completion.
+    """
+    if previous is None:
+        return None
+    updated = record_completion(previous, day)
+    if updated is None:
+        return None
+    return {"stats.last_day": previous.get("last_day")}, {"$set": {"stats": updated}}
+
+
+def rebuild_update(habit: dict) -> dict:
+    return {"$set": {"stats": stats_from_days(all_completed_days(habit))}}
+
+
+def completions_in_window(stats: dict, today: DayLike, days: int) -> int:
+    """Completions in the ``days`` days ending with ``today``."""
+    if not stats or stats.get("last_day") is None:
+        return 0
+    age = max(_ordinal(today) - _ordinal(stats["last_day"]), 0)
+    if age >= days:
+        return 0
+    return bin(stats["window"] & ((1 << (days - age)) - 1)).count("1")
+
+
+def summarize(stats: Optional[dict], today: DayLike) -> dict:
+    """Client-facing view of ``stats`` as of ``today``."""
+    stats = stats or empty_stats()
+    last_day = stats.get("last_day")
+    # A streak survives until the end of the day after its last completion
+    alive = last_day is not None and _ordinal(today) - _ordinal(last_day) <= 1
+    summary = {
+        "current_streak": stats["current_streak"] if alive else 0,
+        "longest_streak": stats["longest_streak"],
+        "total_completions": stats["total"],
+        "last_completed": last_day,
+    }
+    for days in RATE_WINDOWS:
+        count = completions_in_window(stats, today, days)
+        summary[f"completions_{days}d"] = count
+        summary[f"completion_rate_{days}d"] = count / days
+    return summary
+
+
+def summarize_user(habits: list, today: DayLike) -> dict:
+    """Per-habit summaries plus user-wide totals for ``/api/stats``."""
+    summaries = [{"habit_id": habit["id"], "name": habit["name"], **summarize(habit.get("stats"), today)} for habit in habits]
+    count = len(summaries)
+    totals = {
+        "total_habits": count,
+        "best_current_streak": max((s["current_streak"] for s in summaries), default=0),
+        "longest_streak": max((s["longest_streak"] for s in summaries), default=0),
+    }
+    for days in RATE_WINDOWS:
+        key = f"completion_rate_{days}d"
+        totals[key] = sum(s[key] for s in summaries) / count if count else 0
+    return {"habits": summaries, "totals": totals}
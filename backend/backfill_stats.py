@@ -0,0 +1,58 @@
+"""Compute streak / rolling-rate ``stats`` for habits from their completion history.
+
+    python backfill_stats.py [--batch-size 500] [--missing-only] [--dry-run]
+
+Habits without stats are also rebuilt lazily on their next completion, so this
+is only needed to make /api/stats complete for existing data. Safe to run
+while the API is serving: each write is conditional on the stats it read, so
+a completion that lands mid-run is never overwritten.
+"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+from analytics import HISTORY_FIELDS, rebuild_update
+
+
+def backfill(db, batch_size=500, missing_only=False, dry_run=False):
+    query = {"stats": {"$exists": False}} if missing_only else {}
+    cursor = db.habits.find(query, {**HISTORY_FIELDS, "_id": 1, "stats.last_day": 1})
+    updated = 0
+    batch = []
+    for habit in cursor:
+        # Match on the last_day we read; absent stats match a missing field
+        last_day = habit.get("stats", {}).get("last_day")
+        guard = {"stats.last_day": last_day} if "stats" in habit else {"stats": {"$exists": False}}
+        batch.append(UpdateOne({"_id": habit["_id"], **guard}, rebuild_update(habit)))
+        if len(batch) >= batch_size:
+            if not dry_run:
+                db.habits.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        if not dry_run:
+            db.habits.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    return updated
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Backfill habit streak and completion-rate stats")
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URI") or os.getenv("MONGO_URL", "mongodb://localhost:27017/habitmaster"))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--missing-only", action="store_true", help="skip habits that already have stats")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = MongoClient(args.mongo_url).habitmaster
+    updated = backfill(db, batch_size=args.batch_size, missing_only=args.missing_only, dry_run=args.dry_run)
+    print(f"{'Would update' if args.dry_run else 'Updated'} stats for {updated} habits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
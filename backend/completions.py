@@ -0,0 +1,135 @@
+"""Compact completion history.
+
+Completions are stored per habit as ``completions: {"YYYY-MM": <int32 bitmask>}``
+where bit ``day - 1`` is set when the habit was completed that day. A month
+costs a single int32 however many days are ticked, marking a day is an atomic
+``$bit`` update, and "completed on X" is one key lookup plus a bit test (or a
+``$bitsAllSet`` query server-side).
+
+Habits written before this format carry a ``completed_dates`` string array;
+readers fall back to it until ``migrate_completions.py`` has been run.
+"""
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Union
+
+DAY_FORMAT = "%Y-%m-%d"
+
+DayLike = Union[str, date]
+
+
+def _as_date(day: DayLike) -> date:
+    if isinstance(day, str):
+        return datetime.strptime(day, DAY_FORMAT).date()
+    if isinstance(day, datetime):
+        return day.date()
+    return day
+
+
+def month_key(day: DayLike) -> str:
+    day = _as_date(day)
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def day_bit(day: DayLike) -> int:
+    return _as_date(day).day - 1
+
+
+def completion_field(day: DayLike) -> str:
+    return f"completions.{month_key(day)}"
+
+
+def mark_update(day: DayLike) -> dict:
+    """Update document that records a completion on ``day``."""
+    return {"$bit": {completion_field(day): {"or": 1 << day_bit(day)}}}
+
+
+def completed_filter(day: DayLike) -> dict:
+    """Query fragment matching habits completed on ``day``."""
+    return {completion_field(day): {"$bitsAllSet": [day_bit(day)]}}
+
+
+def not_completed_filter(day: DayLike) -> dict:
+    """Query fragment matching habits not yet marked on ``day`` (the month may be absent)."""
+    field = completion_field(day)
+    return {"$or": [{field: {"$exists": False}}, {field: {"$bitsAllClear": [day_bit(day)]}}]}
+
+
+def day_projection_fields(day: DayLike) -> dict:
+    """Projection entries needed to answer ``is_completed(habit, day)``."""
+    legacy = _as_date(day).strftime(DAY_FORMAT)
+    return {
+        completion_field(day): 1,
+        "completed_dates": {"$elemMatch": {"$eq": legacy}},
+    }
+
+
+def completed_expression(day: DayLike) -> dict:
+    """Aggregation expression that is true when the habit was completed on ``day``.
+
+    Tests the bit arithmetically (``floor(mask / 2**bit) mod 2``) so it runs on
+    servers without ``$bitAnd``.
+    """
+    mask = {"$ifNull": [f"${completion_field(day)}", 0]}
+    legacy = _as_date(day).strftime(DAY_FORMAT)
+    return {"$or": [
+        {"$eq": [{"$mod": [{"$floor": {"$divide": [mask, 1 << day_bit(day)]}}, 2]}, 1]},
+        {"$in": [legacy, {"$ifNull": ["$completed_dates", []]}]},
+    ]}
+
+
+def is_completed(habit: dict, day: DayLike) -> bool:
+    mask = habit.get("completions", {}).get(month_key(day), 0)
+    if mask >> day_bit(day) & 1:
+        return True
+    legacy = habit.get("completed_dates")
+    return bool(legacy) and _as_date(day).strftime(DAY_FORMAT) in legacy
+
+
+def apply_completion(habit: dict, day: DayLike) -> dict:
+    """Mirror ``mark_update`` on an in-memory habit document."""
+    months = habit.setdefault("completions", {})
+    months[month_key(day)] = months.get(month_key(day), 0) | 1 << day_bit(day)
+    return habit
+
+
+def completed_days(habit: dict, start: DayLike, end: DayLike) -> List[date]:
+    """Days in ``[start, end]`` on which the habit was completed."""
+    start, end = _as_date(start), _as_date(end)
+    months = habit.get("completions", {})
+    days = []
+    current = start.replace(day=1)
+    while current <= end:
+        mask = months.get(month_key(current), 0)
+        while mask:
+            low = mask & -mask
+            day = current.replace(day=low.bit_length())
+            if start <= day <= end:
+                days.append(day)
+            mask ^= low
+        current = (current + timedelta(days=32)).replace(day=1)
+    legacy = {_as_date(d) for d in habit.get("completed_dates", [])}
+    if legacy:
+        days = sorted(set(days) | {d for d in legacy if start <= d <= end})
+    return days
+
+
+def all_completed_days(habit: dict) -> List[date]:
+    """Every day the habit was completed on, oldest first."""
+    days = set()
+    for key, mask in habit.get("completions", {}).items():
+        month = datetime.strptime(key, "%Y-%m").date()
+        while mask:
+            low = mask & -mask
+            days.add(month.replace(day=low.bit_length()))
+            mask ^= low
+    days.update(_as_date(d) for d in habit.get("completed_dates") or [])
+    return sorted(days)
+
+
+def encode_dates(dates: Iterable[DayLike]) -> dict:
+    """Convert an iterable of days into the ``completions`` month -> bitmask map."""
+    months = {}
+    for day in dates:
+        key = month_key(day)
+        months[key] = months.get(key, 0) | 1 << day_bit(day)
+    return months
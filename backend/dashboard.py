@@ -0,0 +1,50 @@
+from completions import is_completed
+from schedule import is_due
+
+
+def build_dashboard(habits, today: str) -> dict:
+    """Habits, today's completed/pending split and progress from one ``day_projection`` read.
+
+    Only habits scheduled for ``today`` are split and counted towards progress.
+    """
+    all_habits = []
+    completed = []
+    pending = []
+    
+    for habit in habits:
+        all_habits.append({
+            "id": habit["id"],
+            "name": habit["name"],
+            "time": habit["time"],
+            "days": habit["days"],
+            "user_id": habit["user_id"],
+            "created_at": habit["created_at"]
+        })
+        if not is_due(habit, today):
+            continue
+        habit_data = {
+            "id": habit["id"],
+            "name": habit["name"],
+            "time": habit["time"],
+            "days": habit["days"]
+        }
+        
+        if is_completed(habit, today):
+            completed.append(habit_data)
+        else:
+            pending.append(habit_data)
+    
+    total_habits = len(completed) + len(pending)
+    completed_today = len(completed)
+    progress_percentage = (completed_today / total_habits * 100) if total_habits > 0 else 0
+    
+    return {
+        "habits": all_habits,
+        "completed": completed,
+        "pending": pending,
+        "progress": {
+            "total_habits": total_habits,
+            "completed_today": completed_today,
+            "progress_percentage": progress_percentage
+        }
+    }
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import threading
+from collections import deque
+from functools import partial
+
+from pymongo import MongoClient
+
+DEFAULT_MONGO_URL = "mongodb://localhost:27017/habitmaster"
+
+CURSOR_BATCH_SIZE = 100
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def mongo_url_from_env() -> str:
+    return os.getenv("MONGODB_URI") or os.getenv("MONGO_URL", DEFAULT_MONGO_URL)
+
+
+def client_options() -> dict:
+    """Pool settings shared by the pymongo and Motor clients.
+
+    Defaults suit serverless functions: a small pool, one warm connection kept
+    for reuse across invocations and a short server-selection timeout so a
+    cold function fails fast instead of hanging until the platform kills it.
+    """
+    return {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "10")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "1")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+    }
+
+
+def get_client(mongo_url: str = None) -> MongoClient:
+    """Process-wide pymongo client, created on first use and reused afterwards."""
+    mongo_url = mongo_url or mongo_url_from_env()
+    client = _clients.get(mongo_url)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(mongo_url)
+            if client is None:
+                client = _clients[mongo_url] = MongoClient(mongo_url, **client_options())
+    return client
+
+
+def get_database(mongo_url: str = None):
+    return get_client(mongo_url).habitmaster
+
+
+class AsyncCursor:
+    """Motor-style cursor over a pymongo cursor, fetching batches in a worker thread."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._modifiers = []
+        self._cursor = None
+        self._buffer = deque()
+
+    def sort(self, *args, **kwargs):
+        self._modifiers.append(("sort", args, kwargs))
+        return self
+
+    def skip(self, count):
+        self._modifiers.append(("skip", (count,), {}))
+        return self
+
+    def limit(self, count):
+        self._modifiers.append(("limit", (count,), {}))
+        return self
+
+    def _open(self):
+        if self._cursor is None:
+            cursor = self._factory()
+            for name, args, kwargs in self._modifiers:
+                cursor = getattr(cursor, name)(*args, **kwargs)
+            self._cursor = cursor
+        return self._cursor
+
+    def _fetch(self, length):
+        cursor = self._open()
+        docs = []
+        for doc in cursor:
+            docs.append(doc)
+            if length is not None and len(docs) >= length:
+                break
+        return docs
+
+    async def to_list(self, length=None):
+        return await asyncio.to_thread(self._fetch, length)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._buffer:
+            self._buffer.extend(await asyncio.to_thread(self._fetch, CURSOR_BATCH_SIZE))
+            if not self._buffer:
+                raise StopAsyncIteration
+        return self._buffer.popleft()
+
+
+class AsyncCollection:
+    """Awaitable facade over a pymongo collection with the subset of Motor's API we use."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    @property
+    def name(self):
+        return self._collection.name
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(partial(self._collection.find, *args, **kwargs))
+
+    def aggregate(self, pipeline, **kwargs):
+        return AsyncCursor(partial(self._collection.aggregate, pipeline, **kwargs))
+
+    async def _run(self, method, *args, **kwargs):
+        return await asyncio.to_thread(getattr(self._collection, method), *args, **kwargs)
+
+    async def find_one(self, *args, **kwargs):
+        return await self._run("find_one", *args, **kwargs)
+
+    async def insert_one(self, *args, **kwargs):
+        return await self._run("insert_one", *args, **kwargs)
+
+    async def insert_many(self, *args, **kwargs):
+        return await self._run("insert_many", *args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return await self._run("update_one", *args, **kwargs)
+
+    async def update_many(self, *args, **kwargs):
+        return await self._run("update_many", *args, **kwargs)
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return await self._run("find_one_and_update", *args, **kwargs)
+
+    async def delete_one(self, *args, **kwargs):
+        return await self._run("delete_one", *args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs):
+        return await self._run("count_documents", *args, **kwargs)
+
+    async def bulk_write(self, *args, **kwargs):
+        return await self._run("bulk_write", *args, **kwargs)
+
+    async def create_index(self, *args, **kwargs):
+        return await self._run("create_index", *args, **kwargs)
+
+
+class AsyncDatabase:
+    """Sync-driver fallback: exposes a pymongo database through awaitable collections."""
+
+    def __init__(self, database):
+        self._database = database
+        self._collections = {}
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = AsyncCollection(self._database[name])
+        return self._collections[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+def create_database(mongo_url: str, driver: str = None):
+    """Return an async handle on the habitmaster database.
+
+    ``driver`` (default: the MONGO_DRIVER env var) is "motor" for the native async
+    driver or "sync" to run pymongo calls in worker threads. Motor falls back to
+    the sync driver when it is not installed.
+    """
+    driver = driver or os.getenv("MONGO_DRIVER", "motor")
+    if driver == "motor":
+        try:
+            from motor.motor_asyncio import AsyncIOMotorClient
+        except ImportError:
+            driver = "sync"
+        else:
+            return AsyncIOMotorClient(mongo_url, **client_options()).habitmaster
+
+    if driver != "sync":
+        raise ValueError(f"Unknown MONGO_DRIVER: {driver}")
+    return AsyncDatabase(get_database(mongo_url))
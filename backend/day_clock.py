@@ -0,0 +1,71 @@
+"""Per-timezone "today" keys.
+
+Completions are keyed by the user's local calendar day, not the server's.
+DayClock caches the current key for each timezone together with the instant
+of that zone's next local midnight, so the key is recomputed once per day
+boundary rather than formatted on every request. Boundaries are computed in
+the zone itself, so 23- and 25-hour days around DST changes come out right.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from completions import DAY_FORMAT
+
+DEFAULT_TIMEZONE = "UTC"
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        _zone(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return False
+    return True
+
+
+def day_key_at(timestamp: float, tz_name: str):
+    """Return ``(day_key, next_boundary)`` for a POSIX timestamp in ``tz_name``.
+
+    ``next_boundary`` is the timestamp of the next local midnight. Where DST
+    skips midnight the boundary is the first instant of the new day.
+    """
+    zone = _zone(tz_name)
+    local = datetime.fromtimestamp(timestamp, zone)
+    tomorrow = datetime.combine(local.date() + timedelta(days=1), datetime.min.time(), tzinfo=zone)
+    return local.strftime(DAY_FORMAT), tomorrow.timestamp()
+
+
+class DayClock:
+    """Current day key per timezone, recomputed only after that zone's midnight."""
+
+    def __init__(self, default_timezone: str = DEFAULT_TIMEZONE, clock=time.time):
+        self.default_timezone = default_timezone
+        self._clock = clock
+        self._days = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(default_timezone=os.getenv("DEFAULT_TIMEZONE", DEFAULT_TIMEZONE))
+
+    def today(self, tz_name: str = None) -> str:
+        tz_name = tz_name or self.default_timezone
+        now = self._clock()
+        cached = self._days.get(tz_name)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        zone = tz_name if is_valid_timezone(tz_name) else self.default_timezone
+        with self._lock:
+            self._days[tz_name] = day_key_at(now, zone)
+        return self._days[tz_name][0]
+
+    def for_user(self, user: dict) -> str:
+        return self.today(user.get("timezone"))
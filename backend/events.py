@@ -0,0 +1,261 @@
+"""Per-user change events pushed to open dashboards over Server-Sent Events.
+
+EventHub fans events out to one worker's open connections. Each connection is
+a Subscription: a short bounded deque of ready-to-send frames and an
+asyncio.Event, so an idle connection is one parked task and a heartbeat
+timer (about 3.5 KB; see benchmarks/events_benchmark.py). An event is
+serialized once per worker,
+however many connections receive it. A subscriber that falls more than
+``max_pending`` frames behind gets a single ``resync`` event instead and
+re-reads its dashboard.
+
+With a broker (EVENTS_URL) every worker publishes to a shared channel and
+delivers what it receives back, its own events included, so a user's phone
+and laptop see the same stream even when they are connected to different
+workers. LocalBroker is the in-process stand-in; RedisBroker uses Redis
+pub/sub.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from datetime import datetime
+from typing import Iterable, Optional
+
+from schedule import is_due
+
+logger = logging.getLogger("habitmaster.events")
+
+DEFAULT_MAX_PENDING = 64
+CHANNEL = "habitmaster:events"
+
+RESYNC_FRAME = 'event: resync\ndata: {"type":"resync"}\n\n'
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def sse_frame(event: dict) -> str:
+    """The event as one SSE message; its ``version`` becomes the message id."""
+    data = json.dumps(event, default=_default, separators=(",", ":"))
+    return f"id: {event.get('version', '')}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def habits_created(version: int, day: str, habit_docs: Iterable[dict]) -> dict:
+    return {
+        "type": "habits.created",
+        "version": version,
+        "day": day,
+        "habits": [
+            {
+                "id": doc["id"],
+                "name": doc["name"],
+                "time": doc["time"],
+                "days": doc["days"],
+                "user_id": doc["user_id"],
+                "created_at": doc["created_at"],
+                "due": is_due(doc, day),
+            }
+            for doc in habit_docs
+        ],
+    }
+
+
+def habits_completed(version: int, day: str, habit_ids: Iterable[str]) -> dict:
+    return {"type": "habits.completed", "version": version, "day": day, "habit_ids": list(habit_ids)}
+
+
+class Subscription:
+    """One open event stream."""
+
+    __slots__ = ("user_id", "max_pending", "_frames", "_ready", "overflowed")
+
+    def __init__(self, user_id: str, max_pending: int):
+        self.user_id = user_id
+        self.max_pending = max_pending
+        self._frames = deque()
+        self._ready = asyncio.Event()
+        self.overflowed = False
+
+    def push(self, frame: str):
+        if self.overflowed:
+            return
+        if len(self._frames) >= self.max_pending:
+            # Too far behind to be worth replaying; the client re-reads instead
+            self._frames.clear()
+            self._frames.append(RESYNC_FRAME)
+            self.overflowed = True
+        else:
+            self._frames.append(frame)
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """The next frame, or None if nothing arrived within ``timeout`` seconds."""
+        if not self._frames:
+            self._ready.clear()
+            # A timer handle rather than wait_for, which would park a second task per connection
+            timer = asyncio.get_running_loop().call_later(timeout, self._ready.set)
+            try:
+                await self._ready.wait()
+            finally:
+                timer.cancel()
+            if not self._frames:
+                return None
+        frame = self._frames.popleft()
+        if frame is RESYNC_FRAME:
+            self.overflowed = False
+        return frame
+
+
+class LocalBroker:
+    """In-process stand-in for a shared channel: every listening hub receives every message."""
+
+    name = "local"
+
+    def __init__(self):
+        self._listeners = set()
+
+    async def publish(self, message: bytes):
+        for queue in self._listeners:
+            queue.put_nowait(message)
+
+    async def listen(self):
+        queue = asyncio.Queue()
+        self._listeners.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._listeners.discard(queue)
+
+
+class RedisBroker:
+    """Redis pub/sub over an async client (``redis.asyncio``)."""
+
+    name = "redis"
+
+    def __init__(self, client, channel: str = CHANNEL):
+        self.client = client
+        self.channel = channel
+
+    async def publish(self, message: bytes):
+        await self.client.publish(self.channel, message)
+
+    async def listen(self):
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(self.channel)
+
+
+class EventHub:
+    def __init__(self, broker=None, max_pending: int = DEFAULT_MAX_PENDING):
+        self.broker = broker
+        self.max_pending = max_pending
+        self._subscribers = {}
+        self._task = None
+        self.connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.resyncs = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls):
+        max_pending = int(os.getenv("EVENTS_MAX_PENDING", str(DEFAULT_MAX_PENDING)))
+        url = os.getenv("EVENTS_URL")
+        if url == "local://":
+            return cls(LocalBroker(), max_pending)
+        if url:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                logger.warning("EVENTS_URL is set but the redis package is missing; events stay in-process")
+            else:
+                return cls(RedisBroker(aioredis.Redis.from_url(url)), max_pending)
+        return cls(None, max_pending)
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, self.max_pending)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        self.connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None and subscription in subscribers:
+            subscribers.discard(subscription)
+            self.connections -= 1
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    def deliver(self, user_id: str, event: dict):
+        """Hand ``event`` to this worker's subscribers of ``user_id``."""
+        subscribers = self._subscribers.get(user_id)
+        if not subscribers:
+            return
+        frame = sse_frame(event)
+        for subscription in subscribers:
+            if subscription.overflowed:
+                continue
+            subscription.push(frame)
+            if subscription.overflowed:
+                self.resyncs += 1
+            else:
+                self.delivered += 1
+
+    async def publish(self, user_id: str, event: dict):
+        """Send ``event`` to every connection of ``user_id``; never raises, the write it reports has committed."""
+        self.published += 1
+        if self.broker is None:
+            self.deliver(user_id, event)
+            return
+        try:
+            await self.broker.publish(json.dumps({"user_id": user_id, "event": event}, default=_default).encode("utf-8"))
+        except Exception:
+            self.failed += 1
+            logger.exception("publishing %s for user %s failed", event.get("type"), user_id)
+
+    async def start(self):
+        if self.broker is not None and self._task is None:
+            self._task = asyncio.create_task(self._consume())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _consume(self):
+        while True:
+            try:
+                async for message in self.broker.listen():
+                    body = json.loads(message)
+                    self.deliver(body["user_id"], body["event"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("event broker connection lost; reconnecting")
+                await asyncio.sleep(1)
+
+    def stats(self) -> dict:
+        return {
+            "broker": self.broker.name if self.broker is not None else None,
+            "connections": self.connections,
+            "users": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+            "failed": self.failed,
+        }
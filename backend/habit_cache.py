@@ -0,0 +1,255 @@
+"""Per-user cache of the materialized habit list and today's completion state.
+
+Each user has one entry per view: HABITS holds exactly what
+``HabitRepository.list_habits_for_day`` returns for one day, DUE what the
+indexed ``list_due_habits`` returns and PROGRESS the ``(due, completed)`` pair
+from ``count_progress``, each tagged with the user's
+``habits_version`` (see etags.py). Lookups must present the current version,
+so a worker never serves an entry that another worker's write has superseded;
+writes update the lists in place (write-through) when they are exactly one
+version behind and drop them otherwise, then recount PROGRESS from a list.
+
+Entries are stored as JSON bytes either in a per-process LRU bounded by total
+size, or in a shared Redis-protocol store (HABIT_CACHE_URL) so every uvicorn
+worker reads the same entries.
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from completions import apply_completion, is_completed
+from schedule import matches_due_filter
+
+# Views cached per user: every habit with its state for the day, the habits due that day, and the progress counts
+HABITS = "habits"
+DUE = "due"
+PROGRESS = "progress"
+
+# Fields of a habit document kept in an entry (the day projection)
+ENTRY_FIELDS = ("id", "name", "time", "days", "day_mask", "user_id", "created_at", "completions", "completed_dates")
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def as_stored(doc: dict) -> dict:
+    """The entry form of a freshly inserted habit, as a read would return it."""
+    habit = {field: doc[field] for field in ENTRY_FIELDS if field in doc}
+    if isinstance(habit.get("created_at"), datetime):
+        # BSON dates keep milliseconds only
+        created_at = habit["created_at"]
+        habit["created_at"] = created_at.replace(microsecond=created_at.microsecond // 1000 * 1000)
+    return habit
+
+
+def encode_entry(version: int, day: str, data) -> bytes:
+    return json.dumps({"v": version, "day": day, "data": data}, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def decode_entry(raw: bytes) -> dict:
+    entry = json.loads(raw)
+    for habit in entry.get("data") or ():
+        if isinstance(habit, dict) and habit.get("created_at"):
+            habit["created_at"] = datetime.fromisoformat(habit["created_at"])
+    return entry
+
+
+class LocalStore:
+    """In-process LRU of encoded entries, evicting least recently used past ``max_bytes``."""
+
+    name = "local"
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    async def get(self, key: str):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes):
+        await self.delete(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self.bytes += len(value)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    async def delete(self, key: str):
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self.bytes -= len(value)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+
+class RedisStore:
+    """Shared store over an async Redis-protocol client (``redis.asyncio`` or LocalRedis)."""
+
+    name = "redis"
+
+    def __init__(self, client, ttl: int = 86400):
+        self.client = client
+        self.ttl = ttl
+
+    async def get(self, key: str):
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes):
+        await self.client.set(key, value, ex=self.ttl)
+
+    async def delete(self, key: str):
+        await self.client.delete(key)
+
+    def stats(self) -> dict:
+        # Memory limits and eviction are the Redis server's (maxmemory-policy allkeys-lru)
+        return {"ttl": self.ttl}
+
+
+class LocalRedis:
+    """Stand-in for ``redis.asyncio.Redis`` (get / set with ``ex`` / delete) shared within one process."""
+
+    def __init__(self):
+        self._data = {}
+
+    async def get(self, key: str):
+        value, expires = self._data.get(key, (None, None))
+        if expires is not None and expires < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ex: int = None):
+        self._data[key] = (value, time.monotonic() + ex if ex else None)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+
+class HabitCache:
+    def __init__(self, store=None):
+        self.store = store if store is not None else LocalStore()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        url = os.getenv("HABIT_CACHE_URL")
+        if url:
+            ttl = int(os.getenv("HABIT_CACHE_TTL", "86400"))
+            if url == "local://":
+                return cls(RedisStore(LocalRedis(), ttl))
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                pass
+            else:
+                return cls(RedisStore(aioredis.Redis.from_url(url), ttl))
+        return cls(LocalStore(int(os.getenv("HABIT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))))
+
+    @staticmethod
+    def key(user_id: str, view: str = HABITS) -> str:
+        return f"{view}:{user_id}"
+
+    async def _entry(self, user_id: str, view: str):
+        raw = await self.store.get(self.key(user_id, view))
+        entry = decode_entry(raw) if raw is not None else None
+        # Entries written before views existed carry "habits" instead of "data"
+        return entry if entry is not None and "data" in entry else None
+
+    async def _current(self, user_id: str, version: int, day: str, view: str):
+        entry = await self._entry(user_id, view)
+        if entry is None or entry["v"] != version or entry["day"] != day:
+            return None
+        return entry["data"]
+
+    async def get(self, user_id: str, version: int, day: str, view: str = HABITS):
+        """The cached ``view`` for ``day`` at ``version``, or None."""
+        data = await self._current(user_id, version, day, view)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    async def put(self, user_id: str, version: int, day: str, data, view: str = HABITS):
+        await self.store.set(self.key(user_id, view), encode_entry(version, day, data))
+
+    async def _write_through(self, user_id: str, version: int, day: str, view: str, apply):
+        """Replace the ``version - 1`` entry of ``view`` by ``apply(data)``; drop it if stale or apply returns None."""
+        data = await self._current(user_id, version - 1, day, view)
+        data = apply(data) if data is not None else None
+        if data is None:
+            await self.store.delete(self.key(user_id, view))
+            return
+        await self.put(user_id, version, day, data, view)
+
+    async def add_habits(self, user_id: str, version: int, day: str, habit_docs: list):
+        """Write-through for newly inserted habits; ``version`` is the bumped version."""
+        def extend(habits):
+            known = {habit["id"] for habit in habits}
+            habits.extend(as_stored(doc) for doc in habit_docs if doc["id"] not in known)
+            return habits
+
+        def extend_due(habits):
+            known = {habit["id"] for habit in habits}
+            habits.extend(as_stored(doc) for doc in due_docs if doc["id"] not in known)
+            return habits
+
+        due_docs = [doc for doc in habit_docs if matches_due_filter(doc, day)]
+        await self._write_through(user_id, version, day, HABITS, extend)
+        await self._write_through(user_id, version, day, DUE, extend_due)
+        await self._recount(user_id, version, day)
+
+    async def mark_completed(self, user_id: str, version: int, day: str, habit_ids: list):
+        """Write-through for habits just marked completed on ``day``."""
+        ids = set(habit_ids)
+
+        def complete(habits):
+            for habit in habits:
+                if habit["id"] in ids:
+                    apply_completion(habit, day)
+            return habits
+
+        await self._write_through(user_id, version, day, HABITS, complete)
+        await self._write_through(user_id, version, day, DUE, complete)
+        await self._recount(user_id, version, day)
+
+    async def _recount(self, user_id: str, version: int, day: str):
+        """Rebuild PROGRESS at ``version`` from a current HABITS or DUE list, or drop it.
+
+        Counts are derived rather than adjusted: an entry may already include
+        the write being applied (it is tagged with the version read before its
+        query ran), and the deduplicated lists absorb that where a sum would not.
+        """
+        habits = await self._current(user_id, version, day, HABITS)
+        if habits is None:
+            habits = await self._current(user_id, version, day, DUE)
+        if habits is None:
+            await self.store.delete(self.key(user_id, PROGRESS))
+            return
+        due = [habit for habit in habits if matches_due_filter(habit, day)]
+        await self.put(user_id, version, day, [len(due), sum(1 for habit in due if is_completed(habit, day))], PROGRESS)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.store.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            **self.store.stats(),
+        }
@@ -0,0 +1,10 @@
+"""The HabitMaster API as one package shared by every entry point.
+
+Routes live in per-area routers under ``habitmaster.routers``; ``app``
+assembles them into the Railway server, the all-in-one Vercel app or a
+single-route Vercel function. Routers are imported only when an app
+includes them, and the database client and bcrypt pool are created on first
+use, so a single-route function never loads bcrypt, Motor or NumPy unless
+its route needs them. Import time is otherwise dominated by FastAPI and
+pydantic, which every entry point pays alike.
+"""
@@ -0,0 +1,139 @@
+"""App factories for the Railway server and the Vercel functions."""
+import importlib
+import math
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from habitmaster import settings, state
+
+# Everything the full API serves, in include order
+ROUTERS = ("auth", "refresh", "habits", "today", "stats", "events", "metrics", "admin")
+
+
+def load_router(name: str):
+    return importlib.import_module(f"habitmaster.routers.{name}").router
+
+
+def _add_auth_handlers(app: FastAPI):
+    from hashing import HasherSaturated
+    from rate_limit import RateLimited
+
+    @app.exception_handler(RateLimited)
+    async def rate_limited_handler(request, exc):
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many attempts, please retry later"},
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+        )
+
+    @app.exception_handler(HasherSaturated)
+    async def hasher_saturated_handler(request, exc):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server busy, please retry"},
+            headers={"Retry-After": "1"}
+        )
+
+
+def create_app(prefix: str = "/api", routers=ROUTERS, default_driver: str = None, background: bool = True) -> FastAPI:
+    """The full API under ``prefix``.
+
+    ``background`` runs the startup work a long-lived process wants (index
+    bootstrap, the reminder loop) and shuts the bcrypt pool down on exit;
+    request-scoped deployments leave it off.
+    """
+    from fastapi.middleware.cors import CORSMiddleware
+
+    state.default_driver = default_driver
+    app = FastAPI(title="HabitMaster API", version="1.0.0")
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
+    )
+
+    @app.get(f"{prefix}/")
+    async def root():
+        return {"message": "HabitMaster API is running"}
+
+    for name in routers:
+        app.include_router(load_router(name), prefix=prefix)
+    if "auth" in routers:
+        _add_auth_handlers(app)
+
+    if settings.ADMIN_EMAILS:
+        from profiler import ProfileRequestMiddleware
+        from habitmaster.deps import is_admin_request
+
+        # Requests from admins with an X-Profile header are profiled individually
+        app.add_middleware(ProfileRequestMiddleware, store=state.profile_store.resolve(), authorize=is_admin_request)
+
+    if settings.METRICS_ENABLED:
+        from instrumentation import MetricsMiddleware
+
+        # Before the repository creates its client, so every Mongo command is timed
+        state.instrumentation.register_mongo_listener()
+        app.add_middleware(MetricsMiddleware, instrumentation=state.instrumentation.resolve())
+
+    if background:
+        @app.on_event("startup")
+        async def bootstrap_indexes():
+            if settings.ENSURE_INDEXES:
+                from indexes import ensure_indexes
+                await ensure_indexes(state.repo.db)
+
+        @app.on_event("startup")
+        async def start_reminders():
+            await state.reminders.start(state.repo)
+
+        if settings.METRICS_ENABLED:
+            @app.on_event("startup")
+            async def start_loop_lag_probe():
+                await state.instrumentation.start()
+
+            @app.on_event("shutdown")
+            async def stop_loop_lag_probe():
+                await state.instrumentation.stop()
+
+        if "events" in routers:
+            @app.on_event("startup")
+            async def start_events():
+                await state.event_hub.start()
+
+            @app.on_event("shutdown")
+            async def stop_events():
+                await state.event_hub.stop()
+
+        @app.on_event("shutdown")
+        def shutdown_hasher():
+            if state.hasher.peek() is not None:
+                state.hasher.shutdown()
+
+        @app.on_event("shutdown")
+        async def stop_reminders():
+            await state.reminders.stop()
+
+    return app
+
+
+def function_app(router: str, path: str, default_driver: str = "sync") -> FastAPI:
+    """A single-route Vercel function: the routes of ``router`` at ``path``, served from ``/``.
+
+    Only that router's module (and what it imports) is loaded. Invocations may
+    not share an event loop, so the thread-offloaded pymongo driver is the
+    default.
+    """
+    state.default_driver = default_driver
+    app = FastAPI()
+    for route in load_router(router).routes:
+        if route.path == path:
+            app.add_api_route(
+                "/", route.endpoint, methods=list(route.methods), response_model=route.response_model, name=route.name
+            )
+    if router == "auth":
+        _add_auth_handlers(app)
+    return app
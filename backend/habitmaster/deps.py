@@ -0,0 +1,156 @@
+"""Request dependencies and helpers shared by the routers."""
+from datetime import timedelta
+from typing import Optional
+
+import jwt
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from etags import cache_headers, etag_matches, make_etag
+from habit_cache import DUE, HABITS, PROGRESS
+from repository import PRINCIPAL_FIELDS
+from tokens import ACCESS, REFRESH, decode_token, encode_token
+from user_cache import principal_from_claims, to_principal, token_claims
+
+from habitmaster import settings
+from habitmaster.state import habit_cache, repo, token_cache, user_cache
+
+security = HTTPBearer()
+
+
+def create_access_token(data: dict):
+    return encode_token(
+        data, ACCESS, timedelta(minutes=settings.JWT_EXPIRE_MINUTES), settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM
+    )
+
+
+def create_refresh_token(data: dict):
+    return encode_token(
+        data, REFRESH, timedelta(days=settings.JWT_REFRESH_EXPIRE_DAYS), settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM
+    )
+
+
+def issue_tokens(user: dict) -> dict:
+    """A new access/refresh token pair for ``user`` (a users document or principal)."""
+    claims = {"sub": user["email"]}
+    if settings.JWT_EMBED_USER_ID:
+        claims.update(token_claims(user))
+    return {
+        "access_token": create_access_token(claims),
+        "refresh_token": create_refresh_token({"sub": user["email"]}),
+        "token_type": "bearer",
+    }
+
+
+async def load_principal(user_email: str):
+    """The principal for ``user_email``, from user_cache or the users collection; raises 401 if there is none."""
+    user = user_cache.get(user_email)
+    if user is None:
+        db_user = await repo.get_user_by_email(user_email, PRINCIPAL_FIELDS)
+        if db_user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        user = to_principal(db_user)
+        user_cache.set(user_email, user)
+    return user
+
+
+async def user_for_token(token: str):
+    """The principal an access token was issued to; raises 401 if it is invalid."""
+    try:
+        payload = decode_token(token, ACCESS, settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM, cache=token_cache)
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    user_email: str = payload.get("sub")
+    if user_email is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    
+    if settings.JWT_EMBED_USER_ID:
+        principal = principal_from_claims(payload)
+        if principal:
+            return principal
+    
+    return await load_principal(user_email)
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await user_for_token(credentials.credentials)
+
+
+async def require_admin(current_user: dict = Depends(get_current_user)):
+    if current_user["email"].lower() not in settings.ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+
+async def is_admin_authorization(authorization: Optional[str]) -> bool:
+    """Whether an Authorization header value carries an admin's access token."""
+    if not settings.ADMIN_EMAILS:
+        return False
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user = await user_for_token(token)
+    except HTTPException:
+        return False
+    return user["email"].lower() in settings.ADMIN_EMAILS
+
+
+async def is_admin_request(scope) -> bool:
+    """Whether a raw ASGI request carries an admin's access token (for middleware)."""
+    headers = dict(scope["headers"])
+    return await is_admin_authorization(headers.get(b"authorization", b"").decode("latin-1"))
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """The caller's address: the X-Forwarded-For entry added by the outermost of TRUSTED_PROXY_HOPS proxies.
+
+    None when the proxies did not forward one; the socket peer is then a proxy
+    shared by every caller, so per-IP limits are skipped rather than applied to everyone.
+    """
+    if settings.TRUSTED_PROXY_HOPS:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if len(forwarded) >= settings.TRUSTED_PROXY_HOPS:
+            return forwarded[-settings.TRUSTED_PROXY_HOPS]
+        return None
+    return request.client.host if request.client else None
+
+
+async def conditional_get(request: Request, response: Response, user_id: str, *parts):
+    """Tag the response with the user's habit ETag; returns ``(version, 304 response or None)``.
+
+    Only the user's version counter is read, so revalidations never scan habits.
+    The tag covers the endpoint rather than the URL path, which differs
+    between the server and the single-route functions.
+    """
+    version = await repo.get_habits_version(user_id)
+    etag = make_etag(user_id, version, request.scope["endpoint"].__name__, *parts)
+    headers = cache_headers(etag)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return version, Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return version, None
+
+
+async def _cached_view(view: str, load, user_id: str, version: int, day: str):
+    data = await habit_cache.get(user_id, version, day, view)
+    if data is None:
+        data = await load(user_id, day)
+        await habit_cache.put(user_id, version, day, data, view)
+    return data
+
+
+async def habits_for_day(user_id: str, version: int, day: str) -> list:
+    """The user's habits with their completion state for ``day``, served from habit_cache when current."""
+    return await _cached_view(HABITS, repo.list_habits_for_day, user_id, version, day)
+
+
+async def due_habits_for_day(user_id: str, version: int, day: str) -> list:
+    """Only the habits due on ``day`` (the indexed ``list_due_habits`` query), cached like habits_for_day."""
+    return await _cached_view(DUE, repo.list_due_habits, user_id, version, day)
+
+
+async def progress_for_day(user_id: str, version: int, day: str):
+    """``(habits due, completed)`` on ``day``: ``count_progress`` on a habit_cache miss."""
+    total, completed = await _cached_view(PROGRESS, repo.count_progress, user_id, version, day)
+    return total, completed
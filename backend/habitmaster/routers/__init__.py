@@ -0,0 +1 @@
+"""Per-area routers; each module exposes ``router`` with un-prefixed paths."""
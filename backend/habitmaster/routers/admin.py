@@ -0,0 +1,58 @@
+"""Admin-only diagnostics for the worker serving the request."""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from profiler import DEFAULT_INTERVAL, ProfilerBusy, Sampler
+
+from habitmaster import settings
+from habitmaster.deps import require_admin
+from habitmaster.state import profile_store
+
+router = APIRouter()
+
+
+@router.post("/admin/profile")
+async def run_profile(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(DEFAULT_INTERVAL * 1000, ge=1, le=1000),
+    format: str = Query("speedscope", pattern="^(collapsed|speedscope)$"),
+    admin: dict = Depends(require_admin)
+):
+    """Sample every thread of this worker for ``seconds`` and return the profile.
+
+    The profile is also kept (see /admin/profiles) under the id in the
+    ``X-Profile-Id`` header. Behind several workers, each call profiles
+    whichever one received it.
+    """
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.PROFILE_MAX_SECONDS}")
+    try:
+        sampler = Sampler(interval_ms / 1000).start()
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = sampler.stop()
+    profile.label = f"{seconds:g}s worker profile"
+    profile_store.add(profile)
+    
+    body, media_type = profile.render(format)
+    return Response(body, media_type=media_type, headers={"X-Profile-Id": profile.id})
+
+@router.get("/admin/profiles")
+async def list_profiles(admin: dict = Depends(require_admin)):
+    return profile_store.list()
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str,
+    format: str = Query("speedscope", pattern="^(collapsed|speedscope)$"),
+    admin: dict = Depends(require_admin)
+):
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    body, media_type = profile.render(format)
+    return Response(body, media_type=media_type)
@@ -0,0 +1,129 @@
+"""Registration, login and account settings - the only routes that load bcrypt."""
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, EmailStr
+from pymongo.errors import DuplicateKeyError
+
+from day_clock import is_valid_timezone
+from hashing import HasherSaturated
+
+from habitmaster.deps import client_ip, get_current_user, issue_tokens
+from habitmaster.state import day_clock, hasher, rate_limiter, reminders, repo, user_cache
+
+router = APIRouter()
+
+
+class UserCreate(BaseModel):
+    username: str
+    email: EmailStr
+    dob: str
+    password: str
+    timezone: Optional[str] = None
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+class UserResponse(BaseModel):
+    id: str
+    username: str
+    email: str
+    dob: str
+
+class TimezoneUpdate(BaseModel):
+    timezone: str
+
+
+async def hash_password(password: str) -> str:
+    return await hasher.hash(password)
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await hasher.verify(password, hashed)
+
+async def admit(request: Request, action: str, email: str = None):
+    """Shed excess login/registration attempts before they reach the database or bcrypt.
+
+    Raises RateLimited (429) when the caller's IP or the account is over its
+    budget and HasherSaturated (503) when the hashing pool is already full.
+    """
+    await rate_limiter.check(action, ip=client_ip(request), email=email)
+    if hasher.saturated:
+        hasher.metrics.rejected += 1
+        raise HasherSaturated()
+
+
+@router.post("/register", response_model=dict)
+async def register_user(user: UserCreate, request: Request):
+    await admit(request, "register")
+    
+    # Check if user already exists
+    if await repo.email_exists(user.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if user.timezone and not is_valid_timezone(user.timezone):
+        raise HTTPException(status_code=400, detail="Unknown timezone")
+    
+    # Hash password and create user
+    hashed_password = await hash_password(user.password)
+    user_doc = {
+        "id": str(uuid.uuid4()),
+        "username": user.username,
+        "email": user.email,
+        "dob": user.dob,
+        "password": hashed_password,
+        "timezone": user.timezone or day_clock.default_timezone,
+        "created_at": datetime.utcnow()
+    }
+    
+    try:
+        created = await repo.create_user(user_doc)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration (users.email is unique)
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if created:
+        if reminders.peek() is not None:
+            reminders.timezone_changed(user_doc["id"], user_doc["timezone"])
+        return {"message": "User registered successfully", "user_id": user_doc["id"]}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to register user")
+
+@router.post("/login")
+async def login_user(user: UserLogin, request: Request):
+    await admit(request, "login", user.email)
+    
+    # Find user
+    db_user = await repo.get_user_by_email(user.email)
+    if not db_user or not await verify_password(user.password, db_user["password"]):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    
+    # Upgrade the stored hash when BCRYPT_ROUNDS has changed
+    if hasher.needs_rehash(db_user["password"]):
+        try:
+            await repo.update_password(db_user["id"], await hash_password(user.password))
+            user_cache.invalidate(db_user["email"])
+        except HasherSaturated:
+            pass  # retry on a later login
+    
+    # Sessions are renewed through /refresh, not by logging in again
+    return {
+        **issue_tokens(db_user),
+        "user": {
+            "id": db_user["id"],
+            "username": db_user["username"],
+            "email": db_user["email"],
+            "timezone": db_user.get("timezone")
+        }
+    }
+
+@router.put("/user/timezone")
+async def update_timezone(update: TimezoneUpdate, current_user: dict = Depends(get_current_user)):
+    if not is_valid_timezone(update.timezone):
+        raise HTTPException(status_code=400, detail="Unknown timezone")
+    await repo.update_timezone(current_user["id"], update.timezone)
+    user_cache.invalidate(current_user["email"])
+    if reminders.peek() is not None:
+        reminders.timezone_changed(current_user["id"], update.timezone)
+    # Tokens with embedded claims keep the old zone until the next login
+    return {"message": "Timezone updated", "timezone": update.timezone}
@@ -0,0 +1,45 @@
+"""Server-Sent Events stream of the user's habit changes (long-running server only)."""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from habitmaster.deps import user_for_token
+from habitmaster.state import event_hub
+
+router = APIRouter()
+
+# Comment frames keep idle connections open through proxies
+HEARTBEAT_SECONDS = 25.0
+
+
+async def event_stream(user_id: str):
+    # Subscribed inside the generator so the finally below always runs
+    subscription = event_hub.subscribe(user_id)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            frame = await subscription.next(HEARTBEAT_SECONDS)
+            yield frame if frame is not None else ": keepalive\n\n"
+    finally:
+        event_hub.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def stream_events(request: Request, token: Optional[str] = Query(None)):
+    """``habits.created`` / ``habits.completed`` deltas as they commit, and ``resync`` when the client should re-read.
+
+    EventSource cannot set headers, so the access token may be passed as ``?token=``.
+    """
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        credentials = token
+    if not credentials:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    current_user = await user_for_token(credentials)
+    
+    return StreamingResponse(
+        event_stream(current_user["id"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
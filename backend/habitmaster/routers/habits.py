@@ -0,0 +1,144 @@
+"""Listing and creating habits."""
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+
+import events
+from analytics import empty_stats
+from dashboard import build_dashboard
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, ndjson_lines
+from schedule import MASK_FIELD, normalize_days
+
+from habitmaster.deps import conditional_get, get_current_user, habits_for_day
+from habitmaster.settings import MAX_BATCH_SIZE
+from habitmaster.state import day_clock, event_hub, habit_cache, reminders, repo
+
+router = APIRouter()
+
+
+class HabitCreate(BaseModel):
+    name: str
+    time: str
+    days: List[str]
+
+    @field_validator("days")
+    @classmethod
+    def canonical_days(cls, days: List[str]) -> List[str]:
+        return normalize_days(days)[0]
+
+class HabitResponse(BaseModel):
+    id: str
+    name: str
+    time: str
+    days: List[str]
+    user_id: str
+    created_at: datetime
+
+class HabitBatchCreate(BaseModel):
+    habits: List[HabitCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+def new_habit_doc(habit: HabitCreate, user_id: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "name": habit.name,
+        "time": habit.time,
+        "days": habit.days,
+        MASK_FIELD: normalize_days(habit.days)[1],
+        "user_id": user_id,
+        "created_at": datetime.utcnow(),
+        "completions": {},
+        "stats": empty_stats()
+    }
+
+
+@router.get("/habits", response_model=List[HabitResponse])
+async def get_habits(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """List habits oldest first.
+
+    With ``limit`` (or ``cursor``) the result is one keyset page and the
+    ``X-Next-Cursor`` header carries the token for the next one. Clients that
+    send ``Accept: application/x-ndjson`` get every habit streamed from the
+    database cursor, one JSON document per line. Every variant carries an
+    ETag and honours ``If-None-Match``.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    ndjson = "application/x-ndjson" in request.headers.get("accept", "")
+    version, not_modified = await conditional_get(request, response, current_user["id"], limit, cursor, ndjson)
+    if not_modified:
+        return not_modified
+    
+    if ndjson:
+        habits = repo.find_habits(current_user["id"], after=after, limit=limit)
+        return StreamingResponse(ndjson_lines(habits), media_type="application/x-ndjson", headers=response.headers)
+    
+    if limit is None and after is None:
+        today = day_clock.for_user(current_user)
+        habits = sorted(await habits_for_day(current_user["id"], version, today), key=lambda h: (h["created_at"], h["id"]))
+    else:
+        limit = limit or DEFAULT_PAGE_SIZE
+        habits = []
+        # Read one extra document to learn whether another page exists
+        async for habit in repo.find_habits(current_user["id"], after=after, limit=limit + 1):
+            if len(habits) == limit:
+                response.headers["X-Next-Cursor"] = encode_cursor(habits[-1])
+                break
+            habits.append(habit)
+    
+    return [
+        {
+            "id": habit["id"],
+            "name": habit["name"],
+            "time": habit["time"],
+            "days": habit["days"],
+            "user_id": habit["user_id"],
+            "created_at": habit["created_at"]
+        }
+        for habit in habits
+    ]
+
+@router.post("/habits", response_model=dict)
+async def create_habit(habit: HabitCreate, current_user: dict = Depends(get_current_user)):
+    habit_doc = new_habit_doc(habit, current_user["id"])
+    
+    if await repo.create_habit(habit_doc):
+        version = await repo.bump_habits_version(current_user["id"])
+        today = day_clock.for_user(current_user)
+        await habit_cache.add_habits(current_user["id"], version, today, [habit_doc])
+        if reminders.peek() is not None:
+            reminders.habits_created([habit_doc])
+        await event_hub.publish(current_user["id"], events.habits_created(version, today, [habit_doc]))
+        return {"message": "Habit created successfully", "habit_id": habit_doc["id"]}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to create habit")
+
+@router.post("/habits:batch")
+async def create_habits_batch(batch: HabitBatchCreate, current_user: dict = Depends(get_current_user)):
+    habit_docs = [new_habit_doc(habit, current_user["id"]) for habit in batch.habits]
+    await repo.create_habits(habit_docs)
+    version = await repo.bump_habits_version(current_user["id"])
+    
+    today = day_clock.for_user(current_user)
+    await habit_cache.add_habits(current_user["id"], version, today, habit_docs)
+    if reminders.peek() is not None:
+        reminders.habits_created(habit_docs)
+    await event_hub.publish(current_user["id"], events.habits_created(version, today, habit_docs))
+    habits = await habits_for_day(current_user["id"], version, today)
+    return {
+        "results": [{"habit_id": doc["id"], "status": "created"} for doc in habit_docs],
+        "dashboard": build_dashboard(habits, today)
+    }
@@ -0,0 +1,61 @@
+"""Operational counters for the long-running server, for scrapers holding METRICS_TOKEN and for admins."""
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from habitmaster import settings
+from habitmaster.deps import is_admin_authorization
+from habitmaster.state import (
+    event_hub, habit_cache, hasher, instrumentation, rate_limiter, reminders, token_cache, user_cache,
+)
+
+
+async def require_metrics_access(authorization: Optional[str] = Header(None)):
+    """Accept ``Bearer <METRICS_TOKEN>`` or an admin's access token."""
+    if settings.METRICS_TOKEN and hmac.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        return
+    if await is_admin_authorization(authorization):
+        return
+    raise HTTPException(status_code=401, detail="Metrics token or admin access required")
+
+
+router = APIRouter(dependencies=[Depends(require_metrics_access)])
+
+
+@router.get("/metrics")
+async def get_prometheus_metrics():
+    """Request, MongoDB, bcrypt and event-loop metrics in the Prometheus text format."""
+    if instrumentation.peek() is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    from instrumentation import CONTENT_TYPE
+    return Response(instrumentation.render(), media_type=CONTENT_TYPE)
+
+
+@router.get("/metrics/hashing")
+async def get_hashing_metrics():
+    return {**hasher.metrics.snapshot(), "pending": hasher.pending, "rounds": hasher.rounds}
+
+@router.get("/metrics/rate-limit")
+async def get_rate_limit_metrics():
+    return rate_limiter.stats()
+
+@router.get("/metrics/user-cache")
+async def get_user_cache_metrics():
+    return user_cache.stats()
+
+@router.get("/metrics/token-cache")
+async def get_token_cache_metrics():
+    return token_cache.stats()
+
+@router.get("/metrics/habit-cache")
+async def get_habit_cache_metrics():
+    return habit_cache.stats()
+
+@router.get("/metrics/reminders")
+async def get_reminder_metrics():
+    return reminders.stats()
+
+@router.get("/metrics/events")
+async def get_event_metrics():
+    return event_hub.stats()
@@ -0,0 +1,29 @@
+"""Session renewal: a refresh token buys a new token pair without the password."""
+import jwt
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from tokens import REFRESH, decode_token
+
+from habitmaster import settings
+from habitmaster.deps import issue_tokens, load_principal
+
+router = APIRouter()
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
+
+@router.post("/refresh")
+async def refresh_session(body: TokenRefresh):
+    try:
+        payload = decode_token(body.refresh_token, REFRESH, settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    
+    # Re-read the user so deleted accounts stop renewing and embedded claims are current
+    user = await load_principal(payload["sub"])
+    return issue_tokens(user)
@@ -0,0 +1,53 @@
+"""Streak stats and completion reports."""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from analytics import summarize, summarize_user
+
+from habitmaster.deps import conditional_get, get_current_user
+from habitmaster.state import day_clock, repo
+
+router = APIRouter()
+
+
+@router.get("/habits/{habit_id}/stats")
+async def get_habit_stats(habit_id: str, request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    version, not_modified = await conditional_get(request, response, current_user["id"], today)
+    if not_modified:
+        return not_modified
+    habit = await repo.get_habit_stats(habit_id, current_user["id"])
+    if habit is None:
+        raise HTTPException(status_code=404, detail="Habit not found")
+    return {"habit_id": habit["id"], "name": habit["name"], **summarize(habit.get("stats"), today)}
+
+@router.get("/stats")
+async def get_stats(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    version, not_modified = await conditional_get(request, response, current_user["id"], today)
+    if not_modified:
+        return not_modified
+    return summarize_user(await repo.list_habit_stats(current_user["id"]), today)
+
+@router.get("/reports/heatmap")
+async def get_heatmap_report(
+    request: Request,
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    # NumPy is imported on first use, not when the app starts
+    from reporting import MAX_REPORT_DAYS, default_range, stream_matrix, user_report
+    
+    today = day_clock.for_user(current_user)
+    default_start, end = default_range(end or date.fromisoformat(today))
+    start = start or default_start
+    if start > end or (end - start).days >= MAX_REPORT_DAYS:
+        raise HTTPException(status_code=400, detail=f"Report range must cover 1 to {MAX_REPORT_DAYS} days")
+    version, not_modified = await conditional_get(request, response, current_user["id"], today, start, end)
+    if not_modified:
+        return not_modified
+    return user_report(await stream_matrix(repo.find_report_habits(current_user["id"]), start, end))
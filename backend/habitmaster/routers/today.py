@@ -0,0 +1,118 @@
+"""Today's view of a user's habits: completion state, progress and marking habits done."""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+
+import events
+from completions import apply_completion, is_completed
+from dashboard import build_dashboard
+from schedule import is_due
+
+from habitmaster.deps import conditional_get, due_habits_for_day, get_current_user, habits_for_day, progress_for_day
+from habitmaster.settings import MAX_BATCH_SIZE
+from habitmaster.state import day_clock, event_hub, habit_cache, repo
+
+router = APIRouter()
+
+
+class HabitComplete(BaseModel):
+    habit_id: str
+
+class HabitBatchComplete(BaseModel):
+    habit_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+@router.get("/completed-habits")
+async def get_completed_habits(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    version, not_modified = await conditional_get(request, response, current_user["id"], today)
+    if not_modified:
+        return not_modified
+    habits = await due_habits_for_day(current_user["id"], version, today)
+    
+    completed = []
+    pending = []
+    
+    for habit in habits:
+        # The query also matches habits without a day_mask (not yet migrated) on every day
+        if not is_due(habit, today):
+            continue
+        habit_data = {
+            "id": habit["id"],
+            "name": habit["name"],
+            "time": habit["time"],
+            "days": habit["days"]
+        }
+        
+        if is_completed(habit, today):
+            completed.append(habit_data)
+        else:
+            pending.append(habit_data)
+    
+    return {"completed": completed, "pending": pending}
+
+@router.get("/dashboard")
+async def get_dashboard(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    version, not_modified = await conditional_get(request, response, current_user["id"], today)
+    if not_modified:
+        return not_modified
+    habits = await habits_for_day(current_user["id"], version, today)
+    return build_dashboard(habits, today)
+
+@router.get("/progress")
+async def get_progress(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    version, not_modified = await conditional_get(request, response, current_user["id"], today)
+    if not_modified:
+        return not_modified
+    total_habits, completed_today = await progress_for_day(current_user["id"], version, today)
+    
+    progress_percentage = (completed_today / total_habits * 100) if total_habits > 0 else 0
+    
+    return {
+        "total_habits": total_habits,
+        "completed_today": completed_today,
+        "progress_percentage": progress_percentage
+    }
+
+@router.post("/complete-habit")
+async def complete_habit(habit_complete: HabitComplete, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    
+    if await repo.mark_completed(habit_complete.habit_id, current_user["id"], today):
+        version = await repo.bump_habits_version(current_user["id"])
+        await habit_cache.mark_completed(current_user["id"], version, today, [habit_complete.habit_id])
+        await event_hub.publish(current_user["id"], events.habits_completed(version, today, [habit_complete.habit_id]))
+        return {"message": "Habit marked as completed"}
+    else:
+        raise HTTPException(status_code=404, detail="Habit not found or already completed")
+
+@router.post("/complete-habits:batch")
+async def complete_habits_batch(batch: HabitBatchComplete, current_user: dict = Depends(get_current_user)):
+    today = day_clock.for_user(current_user)
+    # One read gives both per-item status and the dashboard we hand back
+    habits = await habits_for_day(current_user["id"], await repo.get_habits_version(current_user["id"]), today)
+    by_id = {habit["id"]: habit for habit in habits}
+    
+    results = []
+    to_complete = []
+    for habit_id in dict.fromkeys(batch.habit_ids):
+        habit = by_id.get(habit_id)
+        if habit is None:
+            results.append({"habit_id": habit_id, "status": "not_found"})
+        elif is_completed(habit, today):
+            results.append({"habit_id": habit_id, "status": "already_completed"})
+        else:
+            results.append({"habit_id": habit_id, "status": "completed"})
+            to_complete.append(habit_id)
+    
+    if await repo.mark_completed_many(to_complete, current_user["id"], today):
+        version = await repo.bump_habits_version(current_user["id"])
+        await habit_cache.mark_completed(current_user["id"], version, today, to_complete)
+        await event_hub.publish(current_user["id"], events.habits_completed(version, today, to_complete))
+    for habit_id in to_complete:
+        apply_completion(by_id[habit_id], today)
+    
+    return {"results": results, "dashboard": build_dashboard(habits, today)}
@@ -0,0 +1,40 @@
+"""Configuration read from the environment at import time.
+
+Load ``.env`` before importing anything from the package (server.py does).
+"""
+import os
+
+# JWT settings - JWT_SECRET on Vercel, JWT_SECRET_KEY in older Railway setups
+JWT_SECRET_KEY = os.getenv("JWT_SECRET") or os.getenv("JWT_SECRET_KEY", "your-secret-key")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "30"))
+# Refresh tokens renew a session without the password until they expire
+JWT_REFRESH_EXPIRE_DAYS = int(os.getenv("JWT_REFRESH_EXPIRE_DAYS", "30"))
+# Trust the user id carried in the token instead of looking the user up
+JWT_EMBED_USER_ID = os.getenv("JWT_EMBED_USER_ID", "false").lower() == "true"
+
+PROGRESS_AGGREGATION = os.getenv("PROGRESS_AGGREGATION", "true").lower() == "true"
+ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "true").lower() == "true"
+
+# Prometheus metrics at /api/metrics; with METRICS_TOKEN set, scrapes must send it as a bearer token
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Users allowed to use the /api/admin endpoints (comma-separated emails); none when unset
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+PROFILE_MAX_SECONDS = int(os.getenv("PROFILE_MAX_SECONDS", "60"))
+
+# Proxies in front of the server that append to X-Forwarded-For; 0 trusts only the socket address.
+# Vercel and Railway (detected by the variables they set) put one edge proxy in front of the app.
+# Rate limits key on the client address this yields
+BEHIND_EDGE_PROXY = bool(os.getenv("VERCEL") or os.getenv("RAILWAY_ENVIRONMENT"))
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1" if BEHIND_EDGE_PROXY else "0"))
+
+# Largest batch accepted by the :batch endpoints
+MAX_BATCH_SIZE = 100
+
+CORS_ORIGINS = [
+    "https://*.vercel.app",  # Vercel frontend
+    "http://localhost:3000",  # Local development
+    "https://localhost:3000",  # Local development with HTTPS
+]
@@ -0,0 +1,115 @@
+"""Process-wide services.
+
+The in-memory caches and the day clock are plain objects. Services that pull
+in an optional heavy module (Motor, bcrypt, redis), start background work or
+must be created in a set order (the Mongo client after the metrics listener
+and the driver choice) are proxies that build their object the first time an
+attribute is read, so a function whose routes never hash a password never
+imports bcrypt.
+"""
+import os
+import threading
+
+from day_clock import DayClock
+from tokens import TokenCache
+from user_cache import UserCache
+
+from habitmaster import settings
+
+
+class Lazy:
+    """Stands in for the object ``factory()`` returns, creating it on first attribute access."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        """The object, creating it if needed."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def peek(self):
+        """The object if it has been created, else None."""
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.resolve(), name)
+
+
+# Driver used when MONGO_DRIVER is unset; entry points without a shared event loop pick "sync"
+default_driver = None
+
+
+def _repo():
+    from database import create_database, mongo_url_from_env
+    from repository import HabitRepository
+
+    driver = os.getenv("MONGO_DRIVER") or default_driver
+    return HabitRepository(create_database(mongo_url_from_env(), driver=driver), use_aggregation=settings.PROGRESS_AGGREGATION)
+
+
+def _habit_cache():
+    # Per-user habit list cache - HABIT_CACHE_URL (shared) or HABIT_CACHE_MAX_BYTES (per worker)
+    from habit_cache import HabitCache
+    return HabitCache.from_env()
+
+
+def _hasher():
+    # Password hashing pool - HASH_WORKERS, HASH_QUEUE_DEPTH, BCRYPT_ROUNDS, HASH_EXECUTOR
+    from hashing import PasswordHasher
+    hasher = PasswordHasher.from_env()
+    if instrumentation.peek() is not None:
+        hasher.metrics.observer = instrumentation.observe_hash
+    return hasher
+
+
+def _rate_limiter():
+    # Login/registration limits - RATE_LIMIT_LOGIN_IP, RATE_LIMIT_LOGIN_EMAIL, RATE_LIMIT_REGISTER_IP, RATE_LIMIT_URL
+    from rate_limit import RateLimiter
+    return RateLimiter.from_env()
+
+
+def _event_hub():
+    # Dashboard push events - EVENTS_URL (shared broker), EVENTS_MAX_PENDING
+    from events import EventHub
+    return EventHub.from_env()
+
+
+def _instrumentation():
+    # Prometheus metrics - LOOP_LAG_INTERVAL (seconds between event-loop lag probes, 0 to disable)
+    from instrumentation import DEFAULT_LOOP_LAG_INTERVAL, Instrumentation
+    return Instrumentation(float(os.getenv("LOOP_LAG_INTERVAL", str(DEFAULT_LOOP_LAG_INTERVAL))))
+
+
+def _profile_store():
+    # Recent profiles from /api/admin/profile and X-Profile requests
+    from profiler import ProfileStore
+    return ProfileStore()
+
+
+def _reminders():
+    # Habit reminders - REMINDERS_ENABLED, REMINDER_SENDER, REMINDER_BATCH_SIZE, REMINDER_GRACE_SECONDS
+    from reminders import ReminderService
+    return ReminderService.from_env()
+
+
+# Authenticated-user cache - USER_CACHE_SIZE, USER_CACHE_TTL (seconds)
+user_cache = UserCache.from_env()
+# Verified access tokens - TOKEN_CACHE_SIZE
+token_cache = TokenCache.from_env()
+# Users' "today" per timezone - DEFAULT_TIMEZONE for users without one
+day_clock = DayClock.from_env()
+
+repo = Lazy(_repo)
+habit_cache = Lazy(_habit_cache)
+hasher = Lazy(_hasher)
+rate_limiter = Lazy(_rate_limiter)
+reminders = Lazy(_reminders)
+event_hub = Lazy(_event_hub)
+instrumentation = Lazy(_instrumentation)
+profile_store = Lazy(_profile_store)
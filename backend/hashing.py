@@ -0,0 +1,137 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import bcrypt
+
+
+class HasherSaturated(Exception):
+    """Raised when the hashing pool and its queue are both full."""
+
+
+def _hash(password: bytes, rounds: int, submitted: float):
+    started = time.monotonic()
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+    return hashed.decode("utf-8"), started - submitted, time.monotonic() - started
+
+
+def _verify(password: bytes, hashed: bytes, submitted: float):
+    started = time.monotonic()
+    ok = bcrypt.checkpw(password, hashed)
+    return ok, started - submitted, time.monotonic() - started
+
+
+def hash_rounds(hashed: str) -> int:
+    # bcrypt hashes look like $2b$12$<salt+digest>
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+class HashMetrics:
+    def __init__(self):
+        # Called as observer(operation, queue_wait, hash_time) for every completed operation
+        self.observer = None
+        self.reset()
+
+    def reset(self):
+        self.operations = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def record(self, queue_wait: float, hash_time: float, operation: str = "hash"):
+        if self.observer is not None:
+            self.observer(operation, queue_wait, hash_time)
+        self.operations += 1
+        self.queue_wait_total += queue_wait
+        self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+        self.hash_time_total += hash_time
+        self.hash_time_max = max(self.hash_time_max, hash_time)
+
+    def snapshot(self) -> dict:
+        ops = self.operations or 1
+        return {
+            "operations": self.operations,
+            "rejected": self.rejected,
+            "queue_wait_avg_ms": self.queue_wait_total / ops * 1000,
+            "queue_wait_max_ms": self.queue_wait_max * 1000,
+            "hash_time_avg_ms": self.hash_time_total / ops * 1000,
+            "hash_time_max_ms": self.hash_time_max * 1000,
+        }
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a bounded worker pool.
+
+    At most ``workers + queue_depth`` operations may be pending; beyond that
+    calls fail fast with HasherSaturated so the API can answer 503.
+    """
+
+    def __init__(self, workers: int = 4, queue_depth: int = 32, rounds: int = 12, executor: str = "thread"):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.rounds = rounds
+        self.executor_kind = executor
+        self.metrics = HashMetrics()
+        self._pending = 0
+        self._executor = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            workers=int(os.getenv("HASH_WORKERS", "4")),
+            queue_depth=int(os.getenv("HASH_QUEUE_DEPTH", "32")),
+            rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+            executor=os.getenv("HASH_EXECUTOR", "thread"),
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def saturated(self) -> bool:
+        """True when the next operation would be rejected; lets callers shed load before other work."""
+        return self._pending >= self.workers + self.queue_depth
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _submit(self, operation: str, fn, *args):
+        if self.saturated:
+            self.metrics.rejected += 1
+            raise HasherSaturated()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, queue_wait, hash_time = await loop.run_in_executor(
+                self._get_executor(), fn, *args, time.monotonic()
+            )
+        finally:
+            self._pending -= 1
+        self.metrics.record(queue_wait, hash_time, operation)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", _hash, password.encode("utf-8"), self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._submit("verify", _verify, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return hash_rounds(hashed) != self.rounds
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
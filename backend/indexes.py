@@ -0,0 +1,165 @@
+"""Index bootstrap and query-plan verification.
+
+    python indexes.py ensure      # create missing indexes
+    python indexes.py verify      # explain() every route query shape, exit 1 on COLLSCAN
+    python indexes.py duplicates  # list the values blocking a unique index
+
+A unique index cannot be built while existing documents share a key (e.g.
+two users registered with one email before ``users_email`` existed). Startup
+then logs the conflicting values and carries on without that index; merge or
+delete the duplicates and run ``python indexes.py ensure``.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+from pymongo import ASCENDING, MongoClient
+from pymongo.errors import OperationFailure
+
+from pagination import keyset_filter
+from repository import due_habits_filter
+
+logger = logging.getLogger("habitmaster.indexes")
+
+# Server error code for a duplicate key, including one found while building a unique index
+DUPLICATE_KEY = 11000
+
+# (collection, keys, options)
+INDEXES = [
+    ("users", [("email", ASCENDING)], {"unique": True, "name": "users_email"}),
+    ("users", [("id", ASCENDING)], {"unique": True, "name": "users_id"}),
+    ("habits", [("user_id", ASCENDING), ("id", ASCENDING)], {"unique": True, "name": "habits_user_id_id"}),
+    ("habits", [("user_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)], {"name": "habits_user_id_created_at_id"}),
+    ("habits", [("user_id", ASCENDING), ("day_mask", ASCENDING)], {"name": "habits_user_id_day_mask"}),
+]
+
+# Every filter the API routes issue, with placeholder values
+QUERY_SHAPES = [
+    ("users", {"email": "user@example.com"}, "get_current_user / register / login"),
+    ("users", {"id": "user-id"}, "update_password"),
+    ("habits", {"user_id": "user-id"}, "list_habits"),
+    ("habits", {"id": "habit-id", "user_id": "user-id"}, "mark_completed"),
+    ("habits", keyset_filter("user-id", (datetime(2024, 1, 1), "habit-id")), "find_habits (next page)"),
+    ("habits", due_habits_filter("user-id", "2024-01-01"), "list_due_habits (completed-habits) / count_progress (progress)"),
+]
+
+
+def duplicates_pipeline(keys, limit: int = None) -> list:
+    """Aggregation grouping documents by ``keys`` and keeping the values held by more than one."""
+    pipeline = [
+        {"$group": {"_id": {field: f"${field}" for field, _ in keys}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$sort": {"count": -1}},
+    ]
+    if limit:
+        pipeline.append({"$limit": limit})
+    return pipeline
+
+
+def log_conflict(collection: str, options: dict, duplicates: list):
+    shown = ", ".join(f"{group['_id']} x{group['count']}" for group in duplicates)
+    logger.error(
+        "unique index %s on %s not built: duplicate keys %s. Remove or merge the duplicates "
+        "(python indexes.py duplicates lists them all), then run python indexes.py ensure",
+        options["name"], collection, shown or "(none found)",
+    )
+
+
+async def ensure_indexes(db):
+    """Create the indexes in INDEXES on an async (Motor-compatible) database handle.
+
+    Returns the names of unique indexes that existing duplicates kept from
+    being built (logged with the offending keys).
+    """
+    conflicts = []
+    for collection, keys, options in INDEXES:
+        try:
+            await db[collection].create_index(keys, **options)
+        except OperationFailure as error:
+            if error.code != DUPLICATE_KEY:
+                raise
+            log_conflict(collection, options, await db[collection].aggregate(duplicates_pipeline(keys, 10)).to_list(None))
+            conflicts.append(options["name"])
+    return conflicts
+
+
+def ensure_indexes_sync(db):
+    conflicts = []
+    for collection, keys, options in INDEXES:
+        try:
+            db[collection].create_index(keys, **options)
+        except OperationFailure as error:
+            if error.code != DUPLICATE_KEY:
+                raise
+            log_conflict(collection, options, list(db[collection].aggregate(duplicates_pipeline(keys, 10))))
+            conflicts.append(options["name"])
+    return conflicts
+
+
+def find_duplicates(db):
+    """``(index name, collection, duplicate groups)`` for every unique index in INDEXES."""
+    return [
+        (options["name"], collection, list(db[collection].aggregate(duplicates_pipeline(keys))))
+        for collection, keys, options in INDEXES
+        if options.get("unique")
+    ]
+
+
+def plan_stages(plan):
+    """Yield every stage name in an explain() plan tree."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+def verify_query_plans(db, shapes=None):
+    """Return (description, collection, stages) for each query shape that scans a collection."""
+    failures = []
+    for collection, query, description in shapes or QUERY_SHAPES:
+        explain = db[collection].find(query).explain()
+        stages = list(plan_stages(explain["queryPlanner"]["winningPlan"]))
+        if "COLLSCAN" in stages:
+            failures.append((description, collection, stages))
+    return failures
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="HabitMaster index management")
+    parser.add_argument("command", choices=["ensure", "verify", "duplicates"])
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URI") or os.getenv("MONGO_URL", "mongodb://localhost:27017/habitmaster"))
+    args = parser.parse_args()
+
+    db = MongoClient(args.mongo_url).habitmaster
+    if args.command == "ensure":
+        logging.basicConfig(format="%(message)s")
+        conflicts = ensure_indexes_sync(db)
+        print(f"Ensured {len(INDEXES) - len(conflicts)} of {len(INDEXES)} indexes")
+        return 1 if conflicts else 0
+
+    if args.command == "duplicates":
+        found = 0
+        for name, collection, groups in find_duplicates(db):
+            for group in groups:
+                print(f"{name}: {collection} {group['_id']} held by {group['count']} documents")
+            found += len(groups)
+        print(f"{found} duplicate keys")
+        return 1 if found else 0
+
+    failures = verify_query_plans(db)
+    for description, collection, stages in failures:
+        print(f"COLLSCAN: {collection} query from {description} -> {' > '.join(stages)}")
+    print(f"Checked {len(QUERY_SHAPES)} query shapes, {len(failures)} collection scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
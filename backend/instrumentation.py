@@ -0,0 +1,223 @@
+"""Request, MongoDB, bcrypt and event-loop metrics in the Prometheus text format.
+
+MetricsMiddleware times every HTTP request by method, route template and
+status, and tracks how many are in flight. A pymongo CommandListener records
+every command's server round trip (Motor runs on pymongo, so both drivers are
+covered), PasswordHasher reports each bcrypt call's queue wait and hash time,
+and a background task measures how late the event loop wakes up from a short
+sleep.
+
+Histograms keep fixed cumulative-bucket counters per label set, so an
+observation is one bisect and a few integer adds under a lock. Rendering walks
+the counters and happens only when /metrics is scraped.
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from typing import Sequence
+
+from pymongo import monitoring
+
+# Request and Mongo latencies, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# bcrypt takes ~50 ms (rounds 10) to ~1 s (rounds 14) per call
+BCRYPT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+LOOP_LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+DEFAULT_LOOP_LAG_INTERVAL = 0.5
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_pairs(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_label_pairs(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_pairs(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_label_pairs(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, amount: float = 1, *labels):
+        self.inc(-amount, *labels)
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_label_pairs(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.histogram.observe(event.duration_micros / 1e6, event.command_name, "ok")
+
+    def failed(self, event):
+        self.histogram.observe(event.duration_micros / 1e6, event.command_name, "failed")
+
+
+class Instrumentation:
+    def __init__(self, loop_lag_interval: float = DEFAULT_LOOP_LAG_INTERVAL):
+        self.loop_lag_interval = loop_lag_interval
+        self.requests = Histogram(
+            "habitmaster_http_request_duration_seconds", "HTTP request latency by route template.",
+            ("method", "route", "status"),
+        )
+        self.in_flight = Gauge("habitmaster_http_requests_in_flight", "HTTP requests being served.", ("method",))
+        self.mongo = Histogram(
+            "habitmaster_mongo_command_duration_seconds", "MongoDB command round trips.", ("command", "outcome"),
+        )
+        self.bcrypt = Histogram(
+            "habitmaster_bcrypt_duration_seconds", "Time spent in bcrypt per call.", ("operation",), BCRYPT_BUCKETS,
+        )
+        self.bcrypt_wait = Histogram(
+            "habitmaster_bcrypt_queue_wait_seconds", "Time bcrypt calls waited for a worker.", ("operation",),
+            BCRYPT_BUCKETS,
+        )
+        self.loop_lag = Histogram(
+            "habitmaster_event_loop_lag_seconds", "How late the event loop woke from a timed sleep.", (),
+            LOOP_LAG_BUCKETS,
+        )
+        self.metrics = [self.requests, self.in_flight, self.mongo, self.bcrypt, self.bcrypt_wait, self.loop_lag]
+        self.mongo_listener = MongoCommandListener(self.mongo)
+        self._registered = False
+        self._task = None
+
+    def register_mongo_listener(self):
+        """Time commands of every MongoClient created from now on."""
+        if not self._registered:
+            monitoring.register(self.mongo_listener)
+            self._registered = True
+
+    def observe_hash(self, operation: str, queue_wait: float, hash_time: float):
+        self.bcrypt.observe(hash_time, operation)
+        self.bcrypt_wait.observe(queue_wait, operation)
+
+    async def _watch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.loop_lag_interval
+            await asyncio.sleep(self.loop_lag_interval)
+            self.loop_lag.observe(max(loop.time() - expected, 0.0))
+
+    async def start(self):
+        if self._task is None and self.loop_lag_interval > 0:
+            self._task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request in ``instrumentation``."""
+
+    def __init__(self, app, instrumentation: Instrumentation):
+        self.app = app
+        self.instrumentation = instrumentation
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        in_flight = self.instrumentation.in_flight
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc(1, method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec(1, method)
+            # The router leaves the matched route in the scope; label by its template, never the raw path
+            route = scope.get("route")
+            self.instrumentation.requests.observe(
+                elapsed, method, getattr(route, "path", "unmatched"), str(status)
+            )
@@ -0,0 +1,59 @@
+"""Migrate legacy ``completed_dates`` string arrays to ``completions`` bitmasks.
+
+    python migrate_completions.py [--batch-size 500] [--dry-run]
+
+Safe to re-run and to run while the API is serving: months are OR-ed into any
+bitmask written since the deploy, then ``completed_dates`` is removed.
+"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+from completions import encode_dates
+
+
+def migration_update(completed_dates) -> dict:
+    update = {"$unset": {"completed_dates": ""}}
+    months = encode_dates(completed_dates)
+    if months:
+        update["$bit"] = {f"completions.{key}": {"or": mask} for key, mask in months.items()}
+    return update
+
+
+def migrate(db, batch_size=500, dry_run=False):
+    cursor = db.habits.find({"completed_dates": {"$exists": True}}, {"_id": 1, "completed_dates": 1})
+    migrated = 0
+    batch = []
+    for habit in cursor:
+        batch.append(UpdateOne({"_id": habit["_id"]}, migration_update(habit.get("completed_dates") or [])))
+        if len(batch) >= batch_size:
+            if not dry_run:
+                db.habits.bulk_write(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+    if batch:
+        if not dry_run:
+            db.habits.bulk_write(batch, ordered=False)
+        migrated += len(batch)
+    return migrated
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Convert completed_dates arrays to completion bitmasks")
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URI") or os.getenv("MONGO_URL", "mongodb://localhost:27017/habitmaster"))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = MongoClient(args.mongo_url).habitmaster
+    migrated = migrate(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    print(f"{'Would migrate' if args.dry_run else 'Migrated'} {migrated} habits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
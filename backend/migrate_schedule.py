@@ -0,0 +1,57 @@
+"""Normalize habit ``days`` lists and store their weekday ``day_mask``.
+
+    python migrate_schedule.py [--batch-size 500] [--dry-run]
+
+Unknown day names are dropped; a habit left with no valid day is due every
+day. Safe to re-run: only habits without a mask are touched.
+"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+from pymongo import MongoClient, UpdateOne
+
+from schedule import MASK_FIELD, habit_mask, mask_days
+
+
+def schedule_update(habit: dict) -> dict:
+    mask = habit_mask(habit)
+    days = mask_days(mask) if habit.get("days") else []
+    return {"$set": {"days": days, MASK_FIELD: mask}}
+
+
+def migrate(db, batch_size=500, dry_run=False):
+    cursor = db.habits.find({MASK_FIELD: {"$exists": False}}, {"_id": 1, "days": 1})
+    migrated = 0
+    batch = []
+    for habit in cursor:
+        batch.append(UpdateOne({"_id": habit["_id"], MASK_FIELD: {"$exists": False}}, schedule_update(habit)))
+        if len(batch) >= batch_size:
+            if not dry_run:
+                db.habits.bulk_write(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+    if batch:
+        if not dry_run:
+            db.habits.bulk_write(batch, ordered=False)
+        migrated += len(batch)
+    return migrated
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Store weekday masks for habit schedules")
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URI") or os.getenv("MONGO_URL", "mongodb://localhost:27017/habitmaster"))
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = MongoClient(args.mongo_url).habitmaster
+    migrated = migrate(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    print(f"{'Would migrate' if args.dry_run else 'Migrated'} {migrated} habits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Keyset pagination and NDJSON streaming for habit listings.
+
+Habits are ordered by ``(created_at, id)``; a page cursor is an opaque,
+URL-safe encoding of the last key returned, so each page is an index range
+scan on ``habits(user_id, created_at, id)`` however deep the client pages.
+"""
+import base64
+import json
+from datetime import datetime
+
+HABIT_SORT = [("created_at", 1), ("id", 1)]
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(habit: dict) -> str:
+    key = [habit["created_at"].isoformat(), habit["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Return ``(created_at, id)``; raises ValueError for malformed tokens."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, habit_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(habit_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_filter(user_id: str, after=None) -> dict:
+    if after is None:
+        return {"user_id": user_id}
+    created_at, habit_id = after
+    return {
+        "user_id": user_id,
+        "$or": [
+            {"created_at": {"$gt": created_at}},
+            {"created_at": created_at, "id": {"$gt": habit_id}}
+        ]
+    }
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def ndjson_line(habit: dict) -> str:
+    return json.dumps(habit, default=_json_default) + "\n"
+
+
+async def ndjson_lines(habits):
+    """Serialize an async iterable of habit documents one line at a time."""
+    async for habit in habits:
+        yield ndjson_line(habit)
@@ -0,0 +1,219 @@
+"""Sampling profiler for a running worker.
+
+A background thread wakes every ``interval`` seconds, reads every other
+thread's current stack with ``sys._current_frames()`` and counts identical
+stacks. Nothing is hooked into the profiled code, so the cost is one stack
+walk per thread per sample (about 1% of a core at the default 10 ms with a
+dozen threads; see benchmarks/profiler_overhead_benchmark.py) and only while
+a profile is running. On the event-loop thread a sample shows whichever
+coroutine was running, so a profile covers every request the worker served
+meanwhile, not just one.
+
+Profiles render as collapsed stacks (``thread;frame;frame count`` lines, for
+flamegraph.pl and most flame graph viewers) or as a speedscope document with
+one sampled profile per thread.
+
+Only one profile runs per process at a time; starting another raises
+ProfilerBusy.
+"""
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Callable, Optional
+
+DEFAULT_INTERVAL = 0.01
+# Frames kept per stack, innermost first; deeper recursion is truncated
+MAX_DEPTH = 128
+
+FORMATS = ("collapsed", "speedscope")
+
+_running = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is already running in this process."""
+
+
+class Profile:
+    def __init__(self, interval: float, started_at: float):
+        self.id = uuid.uuid4().hex[:12]
+        self.interval = interval
+        self.started_at = started_at
+        self.duration = 0.0
+        self.samples = 0
+        # CPU the sampling thread itself used - the profiler's direct overhead
+        self.sampler_cpu = 0.0
+        self.label = ""
+        # (thread name, (frame, ...) outermost first) -> count; frame = (function, file, line)
+        self.stacks = Counter()
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_s": self.duration,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "sampler_cpu_s": self.sampler_cpu,
+        }
+
+    def collapsed(self) -> str:
+        lines = []
+        for (thread, frames), count in self.stacks.most_common():
+            names = [thread] + [f"{function} ({file}:{line})" for function, file, line in frames]
+            lines.append(";".join(name.replace(";", ":") for name in names) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict:
+        # Samples land late when the sampler waits for the GIL, so weight by the measured spacing
+        spacing_ms = self.duration / self.samples * 1000 if self.samples else self.interval * 1000
+        frames = []
+        index = {}
+        threads = OrderedDict()
+        for (thread, stack), count in self.stacks.items():
+            indices = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(index[frame])
+            samples, weights = threads.setdefault(thread, ([], []))
+            samples.append(indices)
+            weights.append(count * spacing_ms)
+        end = self.duration * 1000
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.label or f"profile {self.id}",
+            "exporter": "habitmaster",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": end,
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in threads.items()
+            ],
+        }
+
+    def render(self, fmt: str):
+        """``(body, media type)`` in ``fmt``, one of FORMATS."""
+        if fmt == "speedscope":
+            return json.dumps(self.speedscope()), "application/json"
+        return self.collapsed(), "text/plain; charset=utf-8"
+
+
+class Sampler:
+    """Samples every thread but itself (or only ``thread_ids``) until stopped."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_ids=None):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids else None
+        self.profile = Profile(interval, time.time())
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "Sampler":
+        if not _running.acquire(blocking=False):
+            raise ProfilerBusy()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        self._thread.join()
+        _running.release()
+        return self.profile
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        began = time.perf_counter()
+        cpu_began = time.thread_time()
+        stacks = self.profile.stacks
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (self.thread_ids is not None and ident not in self.thread_ids):
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                name = names.get(ident)
+                if name is None:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    name = names.get(ident, str(ident))
+                stacks[(name, tuple(reversed(stack)))] += 1
+            self.profile.samples += 1
+        self.profile.duration = time.perf_counter() - began
+        self.profile.sampler_cpu = time.thread_time() - cpu_began
+
+
+class ProfileStore:
+    """The most recent profiles, by id."""
+
+    def __init__(self, maxsize: int = 20):
+        self.maxsize = maxsize
+        self._profiles = OrderedDict()
+
+    def add(self, profile: Profile):
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list:
+        return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+class ProfileRequestMiddleware:
+    """Profiles single requests that carry an ``X-Profile`` header and pass ``authorize(scope)``.
+
+    The profile is stored in ``store`` and its id returned in an
+    ``X-Profile-Id`` response header. Requests are served unprofiled when
+    another profile is already running.
+    """
+
+    def __init__(self, app, store: ProfileStore, authorize: Callable, interval: float = 0.001):
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(name == b"x-profile" for name, _ in scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+        if not await self.authorize(scope):
+            await self.app(scope, receive, send)
+            return
+        try:
+            sampler = Sampler(self.interval).start()
+        except ProfilerBusy:
+            await self.app(scope, receive, send)
+            return
+
+        profile = sampler.profile
+        profile.label = f"{scope['method']} {scope['path']}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.store.add(sampler.stop())
@@ -0,0 +1,208 @@
+"""Token-bucket rate limits for the password endpoints.
+
+Each rule is a bucket of ``capacity`` tokens refilled at ``capacity`` per
+``period`` seconds, keyed by client IP or by account email. A request takes
+one token from every bucket that applies, all or none: when one is empty it
+is rejected with the time until a token is back, without spending the others,
+before the handler reads the users collection or queues a bcrypt hash.
+
+Buckets live in a per-process LRU (LocalBucketStore) or, so that every worker
+shares the same budget, in Redis (RATE_LIMIT_URL), where an atomic script
+checks and takes in one round trip ("local://" keeps them in process, for
+development). If the shared store is unreachable, requests are let through
+rather than failing logins outright.
+"""
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger("habitmaster.rate_limit")
+
+
+class Rate(NamedTuple):
+    capacity: int
+    period: float
+
+    @property
+    def per_second(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_rate(spec: str) -> Optional[Rate]:
+    """``"10/60"`` is a burst of 10 refilled at 10 per 60 seconds; ``"0"`` or ``""`` disables the rule."""
+    spec = (spec or "").strip()
+    if spec in ("", "0"):
+        return None
+    capacity, _, period = spec.partition("/")
+    rate = Rate(int(capacity), float(period or 1))
+    if rate.capacity <= 0 or rate.period <= 0:
+        return None
+    return rate
+
+
+# Rule name -> (key kind, default rate)
+DEFAULT_RULES = {
+    "login_ip": ("ip", "20/60"),
+    "login_email": ("email", "10/300"),
+    "register_ip": ("ip", "5/3600"),
+}
+
+
+class RateLimited(Exception):
+    """Raised when a bucket is empty; ``retry_after`` is in seconds."""
+
+    def __init__(self, rule: str, retry_after: float):
+        super().__init__(rule)
+        self.rule = rule
+        self.retry_after = retry_after
+
+
+class LocalBucketStore:
+    """Buckets in this process, least recently used dropped past ``maxsize`` keys."""
+
+    name = "local"
+
+    def __init__(self, maxsize: int = 100000, clock=time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._buckets = OrderedDict()
+
+    async def take(self, buckets: list) -> tuple:
+        """Take a token from each ``(key, Rate)`` if all have one.
+
+        Returns ``(None, 0)`` when taken, else ``(index of the bucket with the
+        longest wait, seconds until it refills)`` with nothing taken.
+        """
+        now = self._clock()
+        levels = []
+        for key, rate in buckets:
+            tokens, updated = self._buckets.get(key, (rate.capacity, now))
+            levels.append(min(rate.capacity, tokens + (now - updated) * rate.per_second))
+        waits = [(1 - tokens) / rate.per_second if tokens < 1 else 0.0 for tokens, (_, rate) in zip(levels, buckets)]
+        blocked = max(range(len(waits)), key=waits.__getitem__)
+        if waits[blocked] > 0:
+            return blocked, waits[blocked]
+        for (key, _), tokens in zip(buckets, levels):
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return None, 0.0
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets), "maxsize": self.maxsize}
+
+
+# KEYS buckets; ARGV now, then capacity and tokens per second for each key.
+# Returns {-1, "0"} when every bucket gave a token, else {0-based index of the longest wait, seconds}.
+TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local blocked, longest = -1, 0
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[2 * i])
+  local rate = tonumber(ARGV[2 * i + 1])
+  local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+  local tokens = tonumber(state[1]) or capacity
+  local ts = tonumber(state[2]) or now
+  tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+  levels[i] = tokens
+  if tokens < 1 and (1 - tokens) / rate > longest then
+    blocked, longest = i - 1, (1 - tokens) / rate
+  end
+end
+if blocked >= 0 then
+  return {blocked, tostring(longest)}
+end
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[2 * i])
+  local rate = tonumber(ARGV[2 * i + 1])
+  redis.call('HSET', KEYS[i], 'tokens', levels[i] - 1, 'ts', now)
+  redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 1)
+end
+return {-1, "0"}
+"""
+
+
+class RedisBucketStore:
+    """Buckets shared by every worker, over an async Redis client (``redis.asyncio``)."""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(TAKE_SCRIPT)
+
+    async def take(self, buckets: list) -> tuple:
+        args = [time.time()]
+        for _, rate in buckets:
+            args.extend((rate.capacity, rate.per_second))
+        blocked, wait = await self._script(keys=[self.prefix + key for key, _ in buckets], args=args)
+        return (None, 0.0) if int(blocked) < 0 else (int(blocked), float(wait))
+
+    def stats(self) -> dict:
+        return {"prefix": self.prefix}
+
+
+class RateLimiter:
+    def __init__(self, store=None, rules: dict = None, enabled: bool = True):
+        self.store = store if store is not None else LocalBucketStore()
+        # Rule name -> (key kind, Rate)
+        self.rules = {name: rule for name, rule in (rules or {}).items() if rule[1] is not None}
+        self.enabled = enabled
+        self.allowed = 0
+        self.rejected = {name: 0 for name in self.rules}
+        self.store_errors = 0
+
+    @classmethod
+    def from_env(cls):
+        rules = {
+            name: (kind, parse_rate(os.getenv(f"RATE_LIMIT_{name.upper()}", default)))
+            for name, (kind, default) in DEFAULT_RULES.items()
+        }
+        enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+        url = os.getenv("RATE_LIMIT_URL")
+        if url and url != "local://":
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                logger.warning("RATE_LIMIT_URL is set but the redis package is missing; limits are per worker")
+            else:
+                return cls(RedisBucketStore(aioredis.Redis.from_url(url)), rules, enabled)
+        return cls(LocalBucketStore(int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))), rules, enabled)
+
+    async def check(self, action: str, ip: Optional[str] = None, email: Optional[str] = None):
+        """Take a token for ``action`` ("login" / "register") from every applicable bucket, or raise RateLimited.
+
+        Rules whose key is missing (e.g. no trustworthy client IP) do not apply.
+        """
+        if not self.enabled:
+            return
+        keys = {"ip": ip, "email": email.lower() if email else None}
+        names = [name for name, (kind, _) in self.rules.items() if name.startswith(action + "_") and keys[kind]]
+        if names:
+            buckets = [(f"{name}:{keys[self.rules[name][0]]}", self.rules[name][1]) for name in names]
+            try:
+                blocked, wait = await self.store.take(buckets)
+            except Exception:
+                self.store_errors += 1
+                logger.exception("rate limit store failed; allowing request")
+                blocked = None
+            if blocked is not None:
+                self.rejected[names[blocked]] += 1
+                raise RateLimited(names[blocked], wait)
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.store.name,
+            "rules": {name: f"{rate.capacity}/{rate.period:g}s per {kind}" for name, (kind, rate) in self.rules.items()},
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "store_errors": self.store_errors,
+            **self.store.stats(),
+        }
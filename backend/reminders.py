@@ -0,0 +1,336 @@
+"""Habit reminders at each habit's ``time`` on its scheduled weekdays.
+
+ReminderScheduler keeps one min-heap entry per habit holding its next fire
+time, computed in the owner's timezone from ``time`` and ``day_mask``.
+Creating a habit or changing a timezone pushes a fresh entry and leaves the
+old one to be skipped when it reaches the top, so the collection is read once
+at startup and never rescanned. Firing a reminder pushes that habit's next
+occurrence, so each reminder costs one heap pop and one push.
+
+ReminderService sleeps until the earliest entry is due (or a new, earlier
+one is added) and hands due reminders to a sender in batches. Senders are
+pluggable via REMINDER_SENDER; run it on a single instance, since every
+instance with REMINDERS_ENABLED fires every reminder.
+"""
+import asyncio
+import heapq
+import importlib
+import itertools
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from day_clock import DEFAULT_TIMEZONE, is_valid_timezone
+from schedule import habit_mask
+
+logger = logging.getLogger("habitmaster.reminders")
+
+DEFAULT_BATCH_SIZE = 500
+# Reminders more than this late (e.g. after downtime) are dropped, not sent
+DEFAULT_GRACE_SECONDS = 300
+# Upper bound on one sleep, so clock jumps are noticed
+MAX_SLEEP_SECONDS = 60.0
+
+
+class Reminder(NamedTuple):
+    habit_id: str
+    user_id: str
+    name: str
+    fire_at: float
+
+
+@lru_cache(maxsize=4096)
+def parse_time(value) -> Optional[tuple]:
+    """``(hour, minute)`` from an ``HH:MM`` string, or None if it is not one."""
+    try:
+        hour, minute = (int(part) for part in str(value).split(":")[:2])
+    except ValueError:
+        return None
+    if 0 <= hour < 24 and 0 <= minute < 60:
+        return hour, minute
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _local_instant(tz_name: str, day: date, hour: int, minute: int) -> float:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=ZoneInfo(tz_name)).timestamp()
+
+
+@lru_cache(maxsize=1024)
+def _local_date(timestamp: float, tz_name: str) -> date:
+    return datetime.fromtimestamp(timestamp, ZoneInfo(tz_name)).date()
+
+
+def next_fire(hour: int, minute: int, mask: int, tz_name: str, after: float) -> float:
+    """First instant after ``after`` that is ``hour:minute`` local time on a weekday in ``mask``.
+
+    Local times skipped by a DST change fire at the equivalent instant after
+    the jump; repeated ones fire on their first occurrence. Both conversions
+    are memoized: a schedule has few distinct (zone, day, time) combinations.
+    """
+    day = _local_date(after, tz_name)
+    for offset in range(8):
+        candidate = day + timedelta(days=offset)
+        if mask & (1 << candidate.weekday()):
+            fire_at = _local_instant(tz_name, candidate, hour, minute)
+            if fire_at > after:
+                return fire_at
+    raise ValueError("empty weekday mask")
+
+
+class _Entry:
+    __slots__ = ("user_id", "name", "hour", "minute", "mask", "fire_at", "seq")
+
+
+class ReminderScheduler:
+    """Next fire time of every habit with a valid ``time``, in a lazily-pruned min-heap."""
+
+    def __init__(self, default_timezone: str = DEFAULT_TIMEZONE):
+        self.default_timezone = default_timezone
+        self._heap = []
+        self._habits = {}
+        self._user_habits = defaultdict(set)
+        self._timezones = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._habits)
+
+    @property
+    def heap_size(self) -> int:
+        return len(self._heap)
+
+    def timezone(self, user_id: str) -> str:
+        return self._timezones.get(user_id, self.default_timezone)
+
+    def _schedule(self, habit_id: str, entry: _Entry, after: float):
+        entry.fire_at = next_fire(entry.hour, entry.minute, entry.mask, self.timezone(entry.user_id), after)
+        entry.seq = next(self._seq)
+        return entry.fire_at, entry.seq, habit_id
+
+    def _entry(self, habit: dict) -> Optional[_Entry]:
+        parsed = parse_time(habit.get("time"))
+        if parsed is None:
+            return None
+        entry = _Entry()
+        entry.user_id = habit["user_id"]
+        entry.name = habit.get("name", "")
+        entry.hour, entry.minute = parsed
+        entry.mask = habit_mask(habit)
+        return entry
+
+    def load(self, habits: Iterable[dict], timezones: dict, now: float) -> int:
+        """Replace the schedule with ``habits``; ``timezones`` maps user id to zone name."""
+        self._timezones = {user_id: tz for user_id, tz in timezones.items() if is_valid_timezone(tz)}
+        self._habits.clear()
+        self._user_habits.clear()
+        heap = []
+        for habit in habits:
+            entry = self._entry(habit)
+            if entry is not None:
+                self._habits[habit["id"]] = entry
+                self._user_habits[entry.user_id].add(habit["id"])
+                heap.append(self._schedule(habit["id"], entry, now))
+        heapq.heapify(heap)
+        self._heap = heap
+        return len(heap)
+
+    def upsert(self, habit: dict, now: float) -> Optional[float]:
+        """Schedule (or reschedule) one habit; returns its next fire time."""
+        self.remove(habit["id"])
+        entry = self._entry(habit)
+        if entry is None:
+            return None
+        self._habits[habit["id"]] = entry
+        self._user_habits[entry.user_id].add(habit["id"])
+        heapq.heappush(self._heap, self._schedule(habit["id"], entry, now))
+        self._compact()
+        return entry.fire_at
+
+    def remove(self, habit_id: str):
+        entry = self._habits.pop(habit_id, None)
+        if entry is not None:
+            self._user_habits[entry.user_id].discard(habit_id)
+
+    def set_timezone(self, user_id: str, tz_name: str, now: float):
+        """Move a user's habits to ``tz_name``."""
+        self._timezones[user_id] = tz_name
+        for habit_id in self._user_habits.get(user_id, ()):
+            heapq.heappush(self._heap, self._schedule(habit_id, self._habits[habit_id], now))
+        self._compact()
+
+    def _compact(self):
+        # Superseded entries are normally popped past; rebuild if they pile up
+        if len(self._heap) > 2 * len(self._habits) + 1024:
+            self._heap = [(entry.fire_at, entry.seq, habit_id) for habit_id, entry in self._habits.items()]
+            heapq.heapify(self._heap)
+
+    def _prune(self):
+        heap = self._heap
+        while heap:
+            fire_at, seq, habit_id = heap[0]
+            entry = self._habits.get(habit_id)
+            if entry is not None and entry.seq == seq:
+                return
+            heapq.heappop(heap)
+
+    def next_fire_at(self) -> Optional[float]:
+        self._prune()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float, limit: int) -> List[Reminder]:
+        """Up to ``limit`` reminders due at ``now``, each rescheduled to its next occurrence."""
+        due = []
+        heap = self._heap
+        while len(due) < limit:
+            self._prune()
+            if not heap or heap[0][0] > now:
+                break
+            fire_at, _, habit_id = heap[0]
+            entry = self._habits[habit_id]
+            due.append(Reminder(habit_id, entry.user_id, entry.name, fire_at))
+            heapq.heapreplace(heap, self._schedule(habit_id, entry, max(fire_at, now)))
+        return due
+
+
+class LogSender:
+    """Logs each reminder; the default sender."""
+
+    async def send(self, reminders: List[Reminder]):
+        for reminder in reminders:
+            logger.info("reminder habit=%s user=%s name=%r", reminder.habit_id, reminder.user_id, reminder.name)
+
+
+class QueueSender:
+    """Collects batches on an asyncio.Queue, for tests and in-process consumers."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def send(self, reminders: List[Reminder]):
+        await self.queue.put(reminders)
+
+
+def sender_from_spec(spec: str):
+    """``log``, ``queue`` or ``package.module:factory`` returning an object with ``async send(reminders)``."""
+    if spec == "log":
+        return LogSender()
+    if spec == "queue":
+        return QueueSender()
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+class ReminderService:
+    """Runs a ReminderScheduler on the event loop and dispatches due reminders in batches."""
+
+    def __init__(self, scheduler: ReminderScheduler, sender, batch_size: int = DEFAULT_BATCH_SIZE,
+                 grace: float = DEFAULT_GRACE_SECONDS, enabled: bool = True, clock=time.time):
+        self.scheduler = scheduler
+        self.sender = sender
+        self.batch_size = batch_size
+        self.grace = grace
+        self.enabled = enabled
+        self._clock = clock
+        self._task = None
+        self._wakeup = asyncio.Event()
+        self.sent = 0
+        self.missed = 0
+        self.failed = 0
+        self.batches = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            ReminderScheduler(os.getenv("DEFAULT_TIMEZONE", DEFAULT_TIMEZONE)),
+            sender_from_spec(os.getenv("REMINDER_SENDER", "log")),
+            batch_size=int(os.getenv("REMINDER_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))),
+            grace=float(os.getenv("REMINDER_GRACE_SECONDS", str(DEFAULT_GRACE_SECONDS))),
+            enabled=os.getenv("REMINDERS_ENABLED", "false").lower() == "true",
+        )
+
+    async def start(self, repo):
+        """Load every habit once and start dispatching."""
+        if not self.enabled or self._task is not None:
+            return
+        timezones = {user["id"]: user["timezone"] async for user in repo.find_user_timezones()}
+        self.scheduler.load([habit async for habit in repo.find_reminder_habits()], timezones, self._clock())
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _rescheduled(self, fire_at: Optional[float]):
+        # Wake the loop if the new entry is due before what it is sleeping on
+        if fire_at is not None and self.scheduler.next_fire_at() == fire_at:
+            self._wakeup.set()
+
+    def habits_created(self, habits: List[dict]):
+        if not self.enabled:
+            return
+        now = self._clock()
+        for habit in habits:
+            self._rescheduled(self.scheduler.upsert(habit, now))
+
+    def timezone_changed(self, user_id: str, tz_name: str):
+        if not self.enabled:
+            return
+        self.scheduler.set_timezone(user_id, tz_name, self._clock())
+        self._wakeup.set()
+
+    async def dispatch_due(self) -> int:
+        """Send every reminder due now; returns how many were sent."""
+        sent = 0
+        while True:
+            now = self._clock()
+            due = self.scheduler.pop_due(now, self.batch_size)
+            if not due:
+                return sent
+            timely = [reminder for reminder in due if now - reminder.fire_at <= self.grace]
+            self.missed += len(due) - len(timely)
+            if not timely:
+                continue
+            try:
+                await self.sender.send(timely)
+            except Exception:
+                self.failed += len(timely)
+                logger.exception("reminder batch of %d failed", len(timely))
+            else:
+                self.sent += len(timely)
+                sent += len(timely)
+            self.batches += 1
+
+    async def run(self):
+        while True:
+            await self.dispatch_due()
+            next_fire_at = self.scheduler.next_fire_at()
+            timeout = MAX_SLEEP_SECONDS if next_fire_at is None else min(max(next_fire_at - self._clock(), 0), MAX_SLEEP_SECONDS)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        next_fire_at = self.scheduler.next_fire_at()
+        return {
+            "enabled": self.enabled,
+            "scheduled": len(self.scheduler),
+            "heap_size": self.scheduler.heap_size,
+            "next_fire_at": datetime.utcfromtimestamp(next_fire_at).isoformat() + "Z" if next_fire_at else None,
+            "sent": self.sent,
+            "missed": self.missed,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
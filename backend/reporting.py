@@ -0,0 +1,213 @@
+"""Vectorized completion reports: heatmaps, weekday rates and cohort retention.
+
+Habit documents are streamed from Mongo and decoded straight into integer day
+offsets from the report's start date, filling a habits x days boolean matrix
+with one fancy-indexing assignment. Every report is then a handful of NumPy
+reductions over that matrix instead of Python loops over date strings.
+
+    python reporting.py heatmap --user-id <id> [--start 2024-01-01] [--end 2024-12-31]
+    python reporting.py weekdays [--user-id <id>]
+    python reporting.py cohorts [--weeks 12]
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, timedelta
+from typing import AsyncIterable, Iterable
+
+import numpy as np
+
+from repository import REPORT_FIELDS
+
+DEFAULT_REPORT_DAYS = 365
+MAX_REPORT_DAYS = 3 * 366
+
+_BITS = np.arange(31, dtype=np.int64)
+
+
+class CompletionMatrix:
+    """Completions of ``n`` habits over the days ``[start, end]``.
+
+    ``matrix[i, d]`` is True when habit ``i`` was completed on ``start + d``;
+    ``created[i]`` is the habit's creation day as an offset from ``start``
+    (negative for habits older than the report).
+    """
+
+    def __init__(self, start: date, end: date, matrix: np.ndarray, created: np.ndarray, user_ids: np.ndarray):
+        self.start = start
+        self.end = end
+        self.matrix = matrix
+        self.created = created
+        self.user_ids = user_ids
+
+    @property
+    def days(self) -> int:
+        return self.matrix.shape[1]
+
+
+def _offsets(values, origin) -> np.ndarray:
+    return (np.array(values, dtype="datetime64[D]") - origin).astype(np.int64)
+
+
+class MatrixBuilder:
+    """Decodes habit documents (REPORT_FIELDS) one at a time, so a cursor can be fed without holding its results."""
+
+    def __init__(self, start: date, end: date):
+        self.start = start
+        self.end = end
+        self.created, self.user_ids = [], []
+        self.mask_rows, self.month_starts, self.masks = [], [], []
+        self.legacy_rows, self.legacy_days = [], []
+
+    def add(self, habit: dict):
+        row = len(self.created)
+        self.created.append(habit.get("created_at") or self.start)
+        self.user_ids.append(habit.get("user_id"))
+        for key, mask in (habit.get("completions") or {}).items():
+            self.mask_rows.append(row)
+            self.month_starts.append(key + "-01")
+            self.masks.append(mask)
+        for day in habit.get("completed_dates") or ():
+            self.legacy_rows.append(row)
+            self.legacy_days.append(day)
+
+    def build(self) -> CompletionMatrix:
+        days = (self.end - self.start).days + 1
+        origin = np.datetime64(self.start, "D")
+        matrix = np.zeros((len(self.created), days), dtype=bool)
+        if self.masks:
+            # One row per (habit, month); bit b of the mask is day first + b
+            bits = (np.array(self.masks, dtype=np.int64)[:, None] >> _BITS) & 1
+            pair, bit = np.nonzero(bits)
+            cols = _offsets(self.month_starts, origin)[pair] + bit
+            keep = (cols >= 0) & (cols < days)
+            matrix[np.array(self.mask_rows)[pair[keep]], cols[keep]] = True
+        if self.legacy_days:
+            cols = _offsets(self.legacy_days, origin)
+            keep = (cols >= 0) & (cols < days)
+            matrix[np.array(self.legacy_rows)[keep], cols[keep]] = True
+
+        return CompletionMatrix(
+            self.start, self.end, matrix, _offsets(self.created, origin), np.array(self.user_ids, dtype=object)
+        )
+
+
+def build_matrix(habits: Iterable[dict], start: date, end: date) -> CompletionMatrix:
+    """Decode habit documents (REPORT_FIELDS) into a CompletionMatrix."""
+    builder = MatrixBuilder(start, end)
+    for habit in habits:
+        builder.add(habit)
+    return builder.build()
+
+
+async def stream_matrix(habits: AsyncIterable[dict], start: date, end: date) -> CompletionMatrix:
+    """build_matrix over an async cursor, decoding each batch as it arrives."""
+    builder = MatrixBuilder(start, end)
+    async for habit in habits:
+        builder.add(habit)
+    return builder.build()
+
+
+def daily_counts(report: CompletionMatrix) -> np.ndarray:
+    return report.matrix.sum(axis=0)
+
+
+def heatmap(report: CompletionMatrix) -> dict:
+    """Completions per day, for a calendar heatmap."""
+    counts = daily_counts(report)
+    return {
+        "start": report.start.isoformat(),
+        "end": report.end.isoformat(),
+        "counts": counts.tolist(),
+        "max": int(counts.max()) if counts.size else 0,
+        "total": int(counts.sum()),
+    }
+
+
+def weekday_rates(report: CompletionMatrix) -> np.ndarray:
+    """Completion rate per weekday (Monday first) over the days each habit existed."""
+    cols = np.arange(report.days)
+    weekday = (report.start.weekday() + cols) % 7
+    # Habits in existence on each day: a sorted search instead of a habits x days mask
+    existing = np.searchsorted(np.sort(report.created), cols, side="right")
+    done = np.bincount(weekday, weights=daily_counts(report), minlength=7)
+    possible = np.bincount(weekday, weights=existing, minlength=7)
+    return np.divide(done, possible, out=np.zeros(7), where=possible > 0)
+
+
+def cohort_retention(report: CompletionMatrix, weeks: int = 12) -> dict:
+    """Share of users active in each week after their first habit, grouped by signup month.
+
+    A user's cohort is the month of their first habit; they count as retained
+    in week ``k`` if any of their habits was completed that week. Weeks that
+    fall outside the report window are excluded from the denominator.
+    """
+    users, user_index = np.unique(report.user_ids.astype(str), return_inverse=True)
+    first = np.full(len(users), np.iinfo(np.int64).max)
+    np.minimum.at(first, user_index, report.created)
+
+    rows, cols = np.nonzero(report.matrix)
+    owner = user_index[rows]
+    week = (cols - first[owner]) // 7
+    keep = (week >= 0) & (week < weeks)
+    active = np.zeros((len(users), weeks), dtype=bool)
+    active[owner[keep], week[keep]] = True
+
+    week_start = first[:, None] + 7 * np.arange(weeks)[None, :]
+    observable = (week_start >= 0) & (week_start < report.days)
+    cohorts = (np.datetime64(report.start, "D") + first).astype("datetime64[M]").astype(str)
+
+    result = []
+    for cohort in np.unique(cohorts):
+        members = cohorts == cohort
+        seen = observable[members].sum(axis=0)
+        retained = (active & observable)[members].sum(axis=0)
+        rates = np.divide(retained, seen, out=np.zeros(weeks), where=seen > 0)
+        result.append({"cohort": str(cohort), "users": int(members.sum()), "retention": rates.round(4).tolist()})
+    return {"weeks": weeks, "cohorts": result}
+
+
+def default_range(end: date = None, days: int = DEFAULT_REPORT_DAYS):
+    end = end or date.today()
+    return end - timedelta(days=days - 1), end
+
+
+def user_report(report: CompletionMatrix) -> dict:
+    """What ``/api/reports/heatmap`` returns for one user."""
+    return {**heatmap(report), "weekday_rates": weekday_rates(report).round(4).tolist()}
+
+
+def main():
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="HabitMaster completion reports")
+    parser.add_argument("report", choices=["heatmap", "weekdays", "cohorts"])
+    parser.add_argument("--mongo-url", default=os.getenv("MONGODB_URI") or os.getenv("MONGO_URL", "mongodb://localhost:27017/habitmaster"))
+    parser.add_argument("--user-id", help="limit the report to one user's habits")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    parser.add_argument("--weeks", type=int, default=12, help="weeks tracked by the cohort report")
+    args = parser.parse_args()
+
+    start, end = default_range(args.end)
+    start = args.start or start
+    query = {"user_id": args.user_id} if args.user_id else {}
+    habits = MongoClient(args.mongo_url).habitmaster.habits.find(query, REPORT_FIELDS, batch_size=1000)
+    report = build_matrix(habits, start, end)
+
+    if args.report == "heatmap":
+        output = heatmap(report)
+    elif args.report == "weekdays":
+        output = dict(zip(["mon", "tue", "wed", "thu", "fri", "sat", "sun"], weekday_rates(report).round(4).tolist()))
+    else:
+        output = cohort_retention(report, args.weeks)
+    json.dump(output, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
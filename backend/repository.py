@@ -0,0 +1,198 @@
+from pymongo import ReturnDocument, UpdateOne
+
+from analytics import HISTORY_FIELDS, rebuild_update, stats_write
+from completions import completed_expression, day_projection_fields, is_completed, mark_update, not_completed_filter
+from etags import VERSION_FIELDS, bump_update, version_of
+from pagination import HABIT_SORT, keyset_filter
+from schedule import MASK_FIELD, due_filter
+
+# Explicit projections for every read - documents never come back whole
+PRINCIPAL_FIELDS = {"_id": 0, "id": 1, "email": 1, "username": 1, "timezone": 1}
+CREDENTIAL_FIELDS = {**PRINCIPAL_FIELDS, "password": 1}
+
+# Fields handlers return for a habit; completion history is never loaded in full
+HABIT_FIELDS = {"_id": 0, "id": 1, "name": 1, "time": 1, "days": 1, "user_id": 1, "created_at": 1}
+
+STATS_FIELDS = {"_id": 0, "id": 1, "name": 1, "stats": 1}
+
+# What reminders.py schedules from
+REMINDER_FIELDS = {"_id": 0, "id": 1, "user_id": 1, "name": 1, "time": 1, "days": 1, MASK_FIELD: 1}
+
+# Everything reporting.py decodes from a habit
+REPORT_FIELDS = {"_id": 0, "user_id": 1, "created_at": 1, "completions": 1, "completed_dates": 1}
+
+
+def day_projection(day: str) -> dict:
+    """HABIT_FIELDS plus the schedule and just enough completion history to answer ``is_due``/``is_completed``."""
+    return {**HABIT_FIELDS, MASK_FIELD: 1, **day_projection_fields(day)}
+
+
+def completion_projection(day: str) -> dict:
+    """Only the completion state for ``day``, for counting."""
+    return {"_id": 0, **day_projection_fields(day)}
+
+
+def due_habits_filter(user_id: str, day: str) -> dict:
+    """A user's habits scheduled on ``day``; served by the ``(user_id, day_mask)`` index."""
+    return {"user_id": user_id, **due_filter(day)}
+
+
+def progress_pipeline(user_id: str, day: str) -> list:
+    """Aggregation returning a single ``{total, completed}`` document over a user's habits due on ``day``."""
+    return [
+        {"$match": due_habits_filter(user_id, day)},
+        {"$project": {"_id": 0, "done": completed_expression(day)}},
+        {"$group": {
+            "_id": None,
+            "total": {"$sum": 1},
+            "completed": {"$sum": {"$cond": ["$done", 1, 0]}}
+        }}
+    ]
+
+
+def progress_counts(result) -> tuple:
+    if not result:
+        return 0, 0
+    return result[0]["total"], result[0]["completed"]
+
+
+class HabitRepository:
+    """User and habit persistence on top of an async (Motor-compatible) database handle."""
+
+    def __init__(self, db, use_aggregation: bool = True):
+        self.db = db
+        # The Python counting path is kept for test doubles without aggregation support
+        self.use_aggregation = use_aggregation
+
+    # Users
+    async def get_user_by_email(self, email: str, projection: dict = CREDENTIAL_FIELDS):
+        return await self.db.users.find_one({"email": email}, projection)
+
+    async def email_exists(self, email: str) -> bool:
+        return await self.db.users.find_one({"email": email}, {"_id": 1}) is not None
+
+    async def create_user(self, user_doc: dict) -> bool:
+        result = await self.db.users.insert_one(user_doc)
+        return bool(result.inserted_id)
+
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        result = await self.db.users.update_one({"id": user_id}, {"$set": {"password": hashed_password}})
+        return bool(result.modified_count)
+
+    async def update_timezone(self, user_id: str, timezone: str) -> bool:
+        result = await self.db.users.update_one({"id": user_id}, {"$set": {"timezone": timezone}})
+        return bool(result.matched_count)
+
+    def find_user_timezones(self):
+        return self.db.users.find({"timezone": {"$type": "string"}}, {"_id": 0, "id": 1, "timezone": 1})
+
+    async def get_habits_version(self, user_id: str) -> int:
+        return version_of(await self.db.users.find_one({"id": user_id}, VERSION_FIELDS))
+
+    async def bump_habits_version(self, user_id: str) -> int:
+        """Invalidate the user's habit ETags and return the new version; call after the habit write has landed."""
+        user = await self.db.users.find_one_and_update(
+            {"id": user_id}, bump_update(), projection=VERSION_FIELDS, return_document=ReturnDocument.AFTER
+        )
+        return version_of(user)
+
+    # Habits
+    async def list_habits(self, user_id: str):
+        return await self.db.habits.find({"user_id": user_id}, HABIT_FIELDS).to_list(None)
+
+    def find_habits(self, user_id: str, after=None, limit: int = None):
+        """Cursor over a user's habits in ``(created_at, id)`` order, starting after a keyset position."""
+        cursor = self.db.habits.find(keyset_filter(user_id, after), HABIT_FIELDS).sort(HABIT_SORT)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    async def list_habits_for_day(self, user_id: str, day: str):
+        return await self.db.habits.find({"user_id": user_id}, day_projection(day)).to_list(None)
+
+    async def list_due_habits(self, user_id: str, day: str):
+        return await self.db.habits.find(due_habits_filter(user_id, day), day_projection(day)).to_list(None)
+
+    async def list_completion_state(self, user_id: str, day: str):
+        return await self.db.habits.find(due_habits_filter(user_id, day), completion_projection(day)).to_list(None)
+
+    async def count_progress(self, user_id: str, day: str):
+        """Return ``(habits_due, completed_on_day)`` for a user."""
+        if not self.use_aggregation:
+            habits = await self.list_completion_state(user_id, day)
+            return len(habits), len([h for h in habits if is_completed(h, day)])
+        
+        result = await self.db.habits.aggregate(progress_pipeline(user_id, day)).to_list(1)
+        return progress_counts(result)
+
+    async def create_habit(self, habit_doc: dict) -> bool:
+        result = await self.db.habits.insert_one(habit_doc)
+        return bool(result.inserted_id)
+
+    async def create_habits(self, habit_docs: list) -> int:
+        result = await self.db.habits.insert_many(habit_docs, ordered=False)
+        return len(result.inserted_ids)
+
+    async def mark_completed_many(self, habit_ids: list, user_id: str, day: str) -> int:
+        """Mark several habits completed in one bulk write; returns how many changed."""
+        if not habit_ids:
+            return 0
+        previous = await self.db.habits.find(
+            {"id": {"$in": habit_ids}, "user_id": user_id}, {"_id": 0, "id": 1, "stats": 1}
+        ).to_list(None)
+        result = await self.db.habits.bulk_write(
+            [UpdateOne({"id": habit_id, "user_id": user_id}, mark_update(day)) for habit_id in habit_ids],
+            ordered=False
+        )
+        await self.record_stats(user_id, [(habit["id"], habit.get("stats")) for habit in previous], day)
+        return result.modified_count
+
+    async def mark_completed(self, habit_id: str, user_id: str, day: str) -> bool:
+        # Marks and returns the pre-update stats in one round trip; None if already completed
+        previous = await self.db.habits.find_one_and_update(
+            {"id": habit_id, "user_id": user_id, **not_completed_filter(day)},
+            mark_update(day),
+            projection={"_id": 0, "stats": 1}
+        )
+        if previous is None:
+            return False
+        await self.record_stats(user_id, [(habit_id, previous.get("stats"))], day)
+        return True
+
+    async def record_stats(self, user_id: str, previous: list, day: str):
+        """Fold a completion on ``day`` into each ``(habit_id, stats before)``."""
+        writes = {}
+        for habit_id, stats in previous:
+            write = stats_write(stats, day)
+            if write is not None:
+                writes[habit_id] = UpdateOne({"id": habit_id, "user_id": user_id, **write[0]}, write[1])
+        rebuild = [habit_id for habit_id, _ in previous if habit_id not in writes]
+        if writes:
+            result = await self.db.habits.bulk_write(list(writes.values()), ordered=False)
+            if result.matched_count < len(writes):
+                # Lost a race with another writer; recompute from history
+                rebuild.extend(writes)
+        if rebuild:
+            await self.rebuild_stats(user_id, rebuild)
+
+    async def rebuild_stats(self, user_id: str, habit_ids: list):
+        habits = await self.db.habits.find({"id": {"$in": habit_ids}, "user_id": user_id}, HISTORY_FIELDS).to_list(None)
+        if habits:
+            await self.db.habits.bulk_write(
+                [UpdateOne({"id": habit["id"], "user_id": user_id}, rebuild_update(habit)) for habit in habits],
+                ordered=False
+            )
+
+    async def get_habit_stats(self, habit_id: str, user_id: str):
+        return await self.db.habits.find_one({"id": habit_id, "user_id": user_id}, STATS_FIELDS)
+
+    async def list_habit_stats(self, user_id: str):
+        return await self.db.habits.find({"user_id": user_id}, STATS_FIELDS).sort(HABIT_SORT).to_list(None)
+
+    def find_reminder_habits(self):
+        """Cursor over every habit, for loading the reminder schedule."""
+        return self.db.habits.find({}, REMINDER_FIELDS)
+
+    def find_report_habits(self, user_id: str):
+        """Cursor over a user's habits as reporting.py decodes them, read in large batches."""
+        return self.db.habits.find({"user_id": user_id}, REPORT_FIELDS, batch_size=1000)
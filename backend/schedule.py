@@ -0,0 +1,84 @@
+"""Scheduled weekdays as a 7-bit mask.
+
+A habit's ``days`` list is normalized when it is written into canonical
+short names plus ``day_mask``, with bit ``i`` set when the habit is scheduled
+on weekday ``i`` (Monday = 0, as ``date.weekday()``). "Due on a day" is then a
+single bit test, in Python and as a ``$bitsAllSet`` query filter on the
+``(user_id, day_mask)`` index.
+
+For habits written before the mask existed, Python readers derive it from
+``days`` while query filters match them on every day, until
+``migrate_schedule.py`` has been run.
+
+An empty ``days`` list means the habit is not tied to particular weekdays and
+is due every day.
+"""
+from typing import Iterable, List, Tuple
+
+from completions import DayLike, _as_date
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+EVERY_DAY = (1 << len(WEEKDAYS)) - 1
+
+MASK_FIELD = "day_mask"
+
+_ALIASES = {name: index for index, name in enumerate(WEEKDAYS)}
+_ALIASES.update({
+    full: index for index, full in enumerate(
+        ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    )
+})
+_ALIASES.update({"tues": 1, "wednes": 2, "thur": 3, "thurs": 3})
+
+
+def weekday_index(name: str) -> int:
+    try:
+        return _ALIASES[name.strip().lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown weekday: {name!r}")
+
+
+def normalize_days(days: Iterable[str]) -> Tuple[List[str], int]:
+    """``(canonical days in week order, day_mask)``; raises ValueError on unknown names."""
+    mask = 0
+    for name in days:
+        mask |= 1 << weekday_index(name)
+    return mask_days(mask), mask or EVERY_DAY
+
+
+def mask_days(mask: int) -> List[str]:
+    return [name for index, name in enumerate(WEEKDAYS) if mask & (1 << index)]
+
+
+def weekday_bit(day: DayLike) -> int:
+    return 1 << _as_date(day).weekday()
+
+
+def habit_mask(habit: dict) -> int:
+    """The habit's day_mask, derived from ``days`` for habits written before it existed."""
+    mask = habit.get(MASK_FIELD)
+    if mask is None:
+        mask = 0
+        for name in habit.get("days") or ():
+            try:
+                mask |= 1 << weekday_index(name)
+            except ValueError:
+                continue
+    return mask or EVERY_DAY
+
+
+def is_due(habit: dict, day: DayLike) -> bool:
+    return bool(habit_mask(habit) & weekday_bit(day))
+
+
+def matches_due_filter(habit: dict, day: DayLike) -> bool:
+    """Whether ``due_filter(day)`` matches the habit (unmigrated habits always do)."""
+    return habit.get(MASK_FIELD) is None or is_due(habit, day)
+
+
+def due_filter(day: DayLike) -> dict:
+    """Query clause matching habits scheduled on ``day`` (and unmigrated habits, which carry no mask)."""
+    return {"$or": [
+        {MASK_FIELD: {"$bitsAllSet": [_as_date(day).weekday()]}},
+        {MASK_FIELD: {"$exists": False}},
+    ]}
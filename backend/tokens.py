@@ -0,0 +1,99 @@
+"""Access and refresh tokens.
+
+Access tokens are short-lived and checked on every request; refresh tokens
+are long-lived and only accepted by the refresh endpoint, which trades one
+for a new pair without touching bcrypt. Both are HS256 JWTs with the same
+secret, told apart by the ``typ`` claim (tokens issued before it existed
+are access tokens).
+
+TokenCache maps already-verified access tokens to their claims until they
+expire, so repeat requests with the same token skip the signature check.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+import jwt
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class TokenCache:
+    """Bounded LRU of verified tokens to their claims, honoring each token's ``exp``."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.time():
+                del self._entries[token]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, claims: dict):
+        # Tokens without an expiry are never cached
+        exp = claims.get("exp")
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[token] = (exp, claims)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def encode_token(claims: dict, typ: str, lifetime: timedelta, secret: str, algorithm: str) -> str:
+    payload = {**claims, "typ": typ, "exp": datetime.utcnow() + lifetime}
+    return jwt.encode(payload, secret, algorithm=algorithm)
+
+
+def decode_token(token: str, typ: str, secret: str, algorithm: str, cache: TokenCache = None) -> dict:
+    """Verified claims of a ``typ`` token; raises jwt.PyJWTError if it is invalid, expired or the wrong type."""
+    claims = cache.get(token) if cache is not None else None
+    if claims is None:
+        claims = jwt.decode(token, secret, algorithms=[algorithm])
+        if claims.get("typ", ACCESS) != typ:
+            raise jwt.InvalidTokenError(f"expected a {typ} token")
+        if cache is not None:
+            cache.put(token, claims)
+    return claims
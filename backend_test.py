@@ -1,17 +1,52 @@
 import requests
+import os
 import sys
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class HabitMasterAPITester:
-    def __init__(self, base_url="http://localhost:8001"):
+    _habit_queries = None
+    
+    def __init__(self, base_url="http://localhost:8001", mongo_url=None):
         self.base_url = base_url
+        self.mongo_url = mongo_url or os.getenv("MONGO_URL", "mongodb://localhost:27017/habitmaster")
         self.token = None
+        self.refresh_token = None
         self.user_id = None
         self.tests_run = 0
         self.tests_passed = 0
         self.created_habit_id = None
 
+    def habit_queries(self):
+        """A pymongo listener, registered once per process, for commands on habits and the documents they return.
+        
+        Clients only pick up listeners registered before they are created, so the in-process app's
+        client must be created after the first call.
+        """
+        if HabitMasterAPITester._habit_queries is None:
+            from pymongo import monitoring
+            
+            class HabitQueries(monitoring.CommandListener):
+                def __init__(self):
+                    self.commands = []
+                    self.documents = []
+                    self.pending = set()
+                def started(self, event):
+                    if event.command.get(event.command_name) == "habits":
+                        self.commands.append(event.command_name)
+                        self.pending.add(event.request_id)
+                def succeeded(self, event):
+                    if event.request_id in self.pending:
+                        self.pending.discard(event.request_id)
+                        cursor = event.reply.get("cursor", {})
+                        self.documents += cursor.get("firstBatch", cursor.get("nextBatch", []))
+                def failed(self, event):
+                    self.pending.discard(event.request_id)
+            
+            HabitMasterAPITester._habit_queries = HabitQueries()
+            monitoring.register(HabitMasterAPITester._habit_queries)
+        return HabitMasterAPITester._habit_queries
+
     def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
         """Run a single API test"""
         url = f"{self.base_url}/{endpoint}"
@@ -104,10 +139,40 @@ class HabitMasterAPITester:
         
         if success and 'access_token' in response:
             self.token = response['access_token']
+            self.refresh_token = response.get('refresh_token')
             print(f"   Token obtained: {self.token[:20]}...")
             return True
         return False
 
+    def test_refresh_session(self):
+        """Test renewing a session with the refresh token"""
+        success, response = self.run_test(
+            "Refresh Session",
+            "POST",
+            "api/refresh",
+            200,
+            data={"refresh_token": self.refresh_token}
+        )
+        if not success or 'access_token' not in response or 'refresh_token' not in response:
+            return False
+        
+        original_token = self.token
+        # An access token is not a refresh token, and vice versa
+        rejected, _ = self.run_test(
+            "Refresh With Access Token",
+            "POST",
+            "api/refresh",
+            401,
+            data={"refresh_token": original_token}
+        )
+        self.token = response['refresh_token']
+        refused, _ = self.run_test("Refresh Token As Bearer", "GET", "api/habits", 401)
+        
+        self.token = response['access_token']
+        self.refresh_token = response['refresh_token']
+        renewed, _ = self.run_test("Renewed Token", "GET", "api/habits", 200)
+        return rejected and refused and renewed
+
     def test_login_invalid_credentials(self):
         """Test login with invalid credentials"""
         login_data = {
@@ -223,6 +288,446 @@ class HabitMasterAPITester:
                 return True
         return False
 
+    def test_get_dashboard(self):
+        """Test the aggregated dashboard endpoint"""
+        success, response = self.run_test(
+            "Get Dashboard",
+            "GET",
+            "api/dashboard",
+            200
+        )
+        
+        if success:
+            expected_fields = ['habits', 'completed', 'pending', 'progress']
+            if all(field in response for field in expected_fields):
+                progress = response['progress']
+                # Only habits scheduled today are split and counted
+                consistent = (
+                    len(response['completed']) + len(response['pending']) <= len(response['habits'])
+                    and progress['total_habits'] == len(response['completed']) + len(response['pending'])
+                    and progress['completed_today'] == len(response['completed'])
+                )
+                print(f"   Dashboard: {len(response['habits'])} habits, {progress['completed_today']} completed today")
+                return consistent
+        return False
+
+    def test_get_stats(self):
+        """Test streak stats for the completed habit and the user-wide summary"""
+        if not self.created_habit_id:
+            print("❌ No habit ID available for stats test")
+            return False
+        
+        success, habit_stats = self.run_test(
+            "Get Habit Stats",
+            "GET",
+            f"api/habits/{self.created_habit_id}/stats",
+            200
+        )
+        if not success:
+            return False
+        
+        success, stats = self.run_test(
+            "Get Stats",
+            "GET",
+            "api/stats",
+            200
+        )
+        if success:
+            print(f"   Streak: {habit_stats['current_streak']} (longest {habit_stats['longest_streak']}), 7d rate {habit_stats['completion_rate_7d']:.2f}")
+            return (
+                habit_stats['current_streak'] >= 1
+                and habit_stats['completions_7d'] >= 1
+                and stats['totals']['best_current_streak'] >= habit_stats['current_streak']
+            )
+        return False
+
+    def test_heatmap_report(self):
+        """Test the completion heatmap includes today's completion"""
+        success, report = self.run_test(
+            "Get Heatmap Report",
+            "GET",
+            "api/reports/heatmap",
+            200
+        )
+        if not success:
+            return False
+        
+        self.run_test(
+            "Reject Inverted Report Range",
+            "GET",
+            "api/reports/heatmap?start=2024-02-01&end=2024-01-01",
+            400
+        )
+        print(f"   {report['total']} completions from {report['start']} to {report['end']}")
+        return len(report['counts']) == 365 and report['counts'][-1] >= 1 and len(report['weekday_rates']) == 7
+
+    def test_event_stream(self):
+        """Test a habit created elsewhere is pushed to an open event stream"""
+        import threading
+        
+        print("\n🔍 Testing Event Stream...")
+        self.tests_run += 1
+        received = []
+        opened = threading.Event()
+        done = threading.Event()
+        
+        def listen():
+            with requests.get(
+                f"{self.base_url}/api/events", params={"token": self.token}, stream=True, timeout=10
+            ) as response:
+                opened.set()
+                for line in response.iter_lines(decode_unicode=True):
+                    if line and line.startswith("data:"):
+                        received.append(json.loads(line[5:]))
+                        if received[-1]["type"] == "habits.created":
+                            break
+            done.set()
+        
+        threading.Thread(target=listen, daemon=True).start()
+        opened.wait(5)
+        _, response = self.run_test(
+            "Create Habit (Pushed)",
+            "POST",
+            "api/habits",
+            200,
+            data={"name": "Stretch", "time": "09:00", "days": []}
+        )
+        done.wait(5)
+        pushed = [event for event in received if event["type"] == "habits.created"]
+        if pushed and pushed[0]["habits"][0]["id"] == response.get("habit_id"):
+            self.tests_passed += 1
+            print(f"✅ Passed - habits.created at version {pushed[0]['version']}")
+            return True
+        print(f"❌ Failed - events received: {received}")
+        return False
+
+    def test_unscheduled_habit_not_due(self):
+        """Test a habit scheduled for another weekday is neither pending nor counted in progress"""
+        weekdays = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+        tomorrow = weekdays[(datetime.utcnow().weekday() + 1) % 7]
+        _, before = self.run_test("Get Progress (Before)", "GET", "api/progress", 200)
+        
+        success, response = self.run_test(
+            "Create Habit Scheduled Tomorrow",
+            "POST",
+            "api/habits",
+            200,
+            data={"name": "Tomorrow Only", "time": "08:00", "days": [tomorrow.upper()]}
+        )
+        if not success:
+            return False
+        habit_id = response['habit_id']
+        
+        self.run_test(
+            "Reject Unknown Weekday",
+            "POST",
+            "api/habits",
+            422,
+            data={"name": "Never", "time": "08:00", "days": ["someday"]}
+        )
+        _, after = self.run_test("Get Progress (After)", "GET", "api/progress", 200)
+        _, status = self.run_test("Get Completed Habits (Scheduled)", "GET", "api/completed-habits", 200)
+        pending_ids = {habit['id'] for habit in status.get('pending', [])}
+        print(f"   Due habits: {before.get('total_habits')} -> {after.get('total_habits')}")
+        return habit_id not in pending_ids and after.get('total_habits') == before.get('total_habits')
+
+    def test_batch_endpoints(self):
+        """Test batch creation and completion return per-item results and the dashboard"""
+        success, response = self.run_test(
+            "Create Habits Batch",
+            "POST",
+            "api/habits:batch",
+            200,
+            data={"habits": [
+                {"name": "Batch Stretch", "time": "07:00", "days": []},
+                {"name": "Batch Journal", "time": "21:00", "days": []}
+            ]}
+        )
+        if not success:
+            return False
+        habit_ids = [item['habit_id'] for item in response['results']]
+        
+        success, response = self.run_test(
+            "Complete Habits Batch",
+            "POST",
+            "api/complete-habits:batch",
+            200,
+            data={"habit_ids": habit_ids + ["missing-habit-id"]}
+        )
+        if success:
+            statuses = {item['habit_id']: item['status'] for item in response['results']}
+            completed_ids = {habit['id'] for habit in response['dashboard']['completed']}
+            print(f"   Batch statuses: {sorted(statuses.values())}")
+            return (
+                all(statuses[habit_id] == "completed" for habit_id in habit_ids)
+                and statuses["missing-habit-id"] == "not_found"
+                and set(habit_ids) <= completed_ids
+            )
+        return False
+
+    def test_conditional_get_skips_habit_scan(self):
+        """Test that If-None-Match revalidations answer 304 without querying habits"""
+        self.tests_run += 1
+        print(f"\n🔍 Testing Conditional GET Skips Habit Scan...")
+        print(f"   Mongo: {self.mongo_url}")
+        
+        # The app runs in-process so its Mongo client reports every command it sends
+        listener = self.habit_queries()
+        os.environ["MONGODB_URI"] = self.mongo_url
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+        import server
+        from fastapi.testclient import TestClient
+        
+        passed = True
+        with TestClient(server.app) as client:
+            email = f"etag_{datetime.now().strftime('%H%M%S%f')}@example.com"
+            client.post("/api/register", json={"username": "etag", "email": email, "dob": "1990-01-01", "password": "TestPass123!"})
+            token = client.post("/api/login", json={"email": email, "password": "TestPass123!"}).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            client.post("/api/habits", json={"name": "ETag Habit", "time": "06:00", "days": ["monday"]}, headers=headers)
+            
+            for route in ["/api/habits", "/api/completed-habits", "/api/progress", "/api/dashboard"]:
+                etag = client.get(route, headers=headers).headers.get("etag")
+                listener.commands.clear()
+                revalidated = client.get(route, headers={**headers, "If-None-Match": etag or ""})
+                ok = etag is not None and revalidated.status_code == 304 and not listener.commands
+                print(f"   {'✅' if ok else '❌'} {route}: {revalidated.status_code}, habits commands {listener.commands}")
+                passed = passed and ok
+        
+        if passed:
+            self.tests_passed += 1
+        return passed
+
+    def test_day_clock_dst_boundaries(self):
+        """Test per-timezone day keys and their cached boundaries across DST changes"""
+        self.tests_run += 1
+        print(f"\n🔍 Testing Day Clock DST Boundaries...")
+        
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+        from datetime import timezone
+        from day_clock import DayClock, day_key_at
+        
+        def utc(*args):
+            return datetime(*args, tzinfo=timezone.utc).timestamp()
+        
+        # (zone, instant, expected day key, hours until the next local midnight)
+        cases = [
+            ("America/New_York", utc(2024, 3, 10, 5, 0), "2024-03-10", 23),   # spring forward
+            ("America/New_York", utc(2024, 11, 3, 4, 0), "2024-11-03", 25),   # fall back
+            ("Europe/London", utc(2024, 3, 31, 0, 30), "2024-03-31", 22.5),
+            ("America/Santiago", utc(2024, 9, 7, 12, 0), "2024-09-07", 16),   # midnight skipped
+            ("Pacific/Kiritimati", utc(2024, 1, 1, 10, 0), "2024-01-02", 24),  # UTC+14
+        ]
+        passed = True
+        for zone, instant, expected, hours in cases:
+            key, boundary = day_key_at(instant, zone)
+            ok = key == expected and (boundary - instant) / 3600 == hours
+            print(f"   {'✅' if ok else '❌'} {zone} -> {key}, next boundary in {(boundary - instant) / 3600}h")
+            passed = passed and ok
+        
+        # The cached key flips exactly at the local midnight that follows a DST change
+        now = [utc(2024, 3, 10, 3, 59)]
+        clock = DayClock(clock=lambda: now[0])
+        keys = [clock.today("America/New_York")]
+        now[0] = utc(2024, 3, 11, 3, 59)
+        keys.append(clock.today("America/New_York"))
+        now[0] = utc(2024, 3, 11, 4, 0)
+        keys.append(clock.today("America/New_York"))
+        ok = keys == ["2024-03-09", "2024-03-10", "2024-03-11"] and clock.today("Not/AZone") == clock.today("UTC")
+        print(f"   {'✅' if ok else '❌'} cached keys {keys}")
+        passed = passed and ok
+        
+        if passed:
+            self.tests_passed += 1
+        return passed
+
+    def test_progress_cache_write_through(self):
+        """Test that cached progress counts stay exact when an entry already includes the write"""
+        self.tests_run += 1
+        print(f"\n🔍 Testing Progress Cache Write-Through...")
+        
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+        import asyncio
+        from habit_cache import HABITS, PROGRESS, HabitCache
+        
+        day = "2024-03-11"
+        
+        def habit(habit_id):
+            return {"id": habit_id, "name": habit_id, "time": "07:00", "days": [], "user_id": "u", "created_at": datetime(2024, 1, 1)}
+        
+        async def scenario():
+            cache = HabitCache()
+            # Entries tagged v3 were loaded after habit "b" (v4) had been inserted; without a
+            # current list the counts are dropped and recounted on the next read rather than guessed
+            await cache.put("u", 3, day, [2, 0], PROGRESS)
+            await cache.add_habits("u", 4, day, [habit("b")])
+            results = [await cache.get("u", 4, day, PROGRESS)]
+            await cache.put("u", 3, day, [habit("a"), habit("b")], HABITS)
+            await cache.put("u", 3, day, [2, 0], PROGRESS)
+            await cache.add_habits("u", 4, day, [habit("b")])
+            results.append(await cache.get("u", 4, day, PROGRESS))
+            # Completing the same habit twice counts it once
+            await cache.mark_completed("u", 5, day, ["a"])
+            await cache.mark_completed("u", 6, day, ["a"])
+            results.append(await cache.get("u", 6, day, PROGRESS))
+            return results
+        
+        results = asyncio.run(scenario())
+        passed = results == [None, [2, 0], [2, 1]]
+        print(f"   {'✅' if passed else '❌'} progress entries {results}")
+        
+        if passed:
+            self.tests_passed += 1
+        return passed
+
+    def test_reminder_schedule(self):
+        """Test reminder fire times across DST and batched dispatch after a timezone change"""
+        self.tests_run += 1
+        print(f"\n🔍 Testing Reminder Schedule...")
+        
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+        import asyncio
+        from datetime import timezone
+        from reminders import QueueSender, ReminderScheduler, ReminderService, next_fire
+        
+        def utc(*args):
+            return datetime(*args, tzinfo=timezone.utc).timestamp()
+        
+        # 02:30 does not exist in New York on 2024-03-10; it fires at 03:30 EDT
+        fires = [next_fire(2, 30, 0x7f, "America/New_York", utc(2024, 3, 9, 12, 0))]
+        fires.append(next_fire(2, 30, 0x7f, "America/New_York", fires[0]))
+        expected = [utc(2024, 3, 10, 7, 30), utc(2024, 3, 11, 6, 30)]
+        passed = fires == expected
+        print(f"   {'✅' if passed else '❌'} DST fire times {fires}")
+        
+        now = [utc(2024, 3, 11, 10, 59)]  # Monday 06:59 in New York
+        scheduler = ReminderScheduler()
+        scheduler.load([
+            {"id": f"h{i}", "user_id": "u1", "name": "Read", "time": "07:00", "day_mask": 0b1} for i in range(3)
+        ] + [{"id": "h-bad-time", "user_id": "u1", "name": "Bad", "time": "later", "day_mask": 0x7f}], {}, now[0])
+        sender = QueueSender()
+        service = ReminderService(scheduler, sender, batch_size=2, clock=lambda: now[0])
+        service.timezone_changed("u1", "America/New_York")
+        now[0] += 60
+        sent = asyncio.run(service.dispatch_due())
+        batches = [sender.queue.get_nowait() for _ in range(sender.queue.qsize())]
+        ok = len(scheduler) == 3 and sent == 3 and [len(b) for b in batches] == [2, 1] and scheduler.next_fire_at() == utc(2024, 3, 18, 11, 0)
+        print(f"   {'✅' if ok else '❌'} dispatched {sent} in batches {[len(b) for b in batches]}, next {scheduler.next_fire_at()}")
+        passed = passed and ok
+        
+        if passed:
+            self.tests_passed += 1
+        return passed
+
+    def test_projected_payloads(self):
+        """Test that habit queries leave out completion history however old the habit is"""
+        self.tests_run += 1
+        print(f"\n🔍 Testing Projected Payloads...")
+        print(f"   Mongo: {self.mongo_url}")
+        
+        from pymongo import MongoClient
+        
+        # The app runs in-process so its Mongo client reports the documents each query returns
+        listener = self.habit_queries()
+        os.environ["MONGODB_URI"] = self.mongo_url
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+        import server
+        from etags import bump_update
+        from fastapi.testclient import TestClient
+        
+        passed = True
+        with TestClient(server.app) as client:
+            email = f"projection_{datetime.now().strftime('%H%M%S%f')}@example.com"
+            user_id = client.post("/api/register", json={"username": "projection", "email": email, "dob": "1990-01-01", "password": "TestPass123!"}).json()["user_id"]
+            token = client.post("/api/login", json={"email": email, "password": "TestPass123!"}).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            habit_id = client.post("/api/habits", json={"name": "Old Habit", "time": "06:00", "days": ["monday"]}, headers=headers).json()["habit_id"]
+            
+            # Age the habit by five years (legacy and bitmask history, never this month)
+            db = MongoClient(self.mongo_url).habitmaster
+            now = datetime.now()
+            old_days = [now - timedelta(days=d) for d in range(40, 40 + 5 * 365)]
+            db.habits.update_one({"id": habit_id}, {"$set": {
+                "completed_dates": [d.strftime("%Y-%m-%d") for d in old_days],
+                **{f"completions.{d.strftime('%Y-%m')}": 0x7fffffff for d in old_days}
+            }})
+            # Only today's entry (in local time or UTC, whichever the user's day is) may be read back
+            today = {now.strftime("%Y-%m-%d"), datetime.utcnow().strftime("%Y-%m-%d")}
+            current_months = {day[:7] for day in today}
+            
+            for route in ["/api/habits", "/api/habits?limit=10", "/api/dashboard", "/api/progress", "/api/completed-habits"]:
+                # A new version so each route reads from MongoDB rather than a list cached by the one before
+                db.users.update_one({"id": user_id}, bump_update())
+                listener.documents.clear()
+                response = client.get(route, headers=headers)
+                history = [
+                    sorted(set(doc.get("completed_dates") or []) - today) + sorted(set(doc.get("completions") or {}) - current_months)
+                    for doc in listener.documents
+                ]
+                history = [keys for keys in history if keys]
+                ok = response.status_code == 200 and bool(listener.documents) and not history
+                print(f"   {'✅' if ok else '❌'} {route}: {response.status_code}, {len(listener.documents)} habit documents read"
+                      + (f", history {history[0][:3]}..." if history else ""))
+                passed = passed and ok
+        
+        if passed:
+            self.tests_passed += 1
+        return passed
+
+    def test_prometheus_metrics(self):
+        """Test /api/metrics needs the metrics token and exposes per-route latency and bcrypt timings"""
+        print("\n🔍 Testing Prometheus Metrics...")
+        self.tests_run += 1
+        anonymous = requests.get(f"{self.base_url}/api/metrics/rate-limit")
+        if anonymous.status_code != 401:
+            print(f"❌ Failed - /api/metrics/rate-limit without a token: {anonymous.status_code}")
+            return False
+        token = os.getenv("METRICS_TOKEN", "")
+        response = requests.get(f"{self.base_url}/api/metrics", headers={"Authorization": f"Bearer {token}"})
+        body = response.text
+        expected = [
+            'habitmaster_http_request_duration_seconds_bucket{method="POST",route="/api/login",status="200",le="+Inf"}',
+            'habitmaster_bcrypt_duration_seconds_count{operation="verify"}',
+            "habitmaster_http_requests_in_flight",
+        ]
+        missing = [line for line in expected if line not in body]
+        if response.status_code == 200 and response.headers["content-type"].startswith("text/plain") and not missing:
+            self.tests_passed += 1
+            print(f"✅ Passed - {len(body.splitlines())} lines")
+            return True
+        print(f"❌ Failed - Status: {response.status_code}, missing: {missing}")
+        return False
+
+    def test_admin_profile_requires_admin(self):
+        """Test the profiler endpoint refuses a regular user"""
+        success, _ = self.run_test(
+            "Profile As Non-Admin",
+            "POST",
+            "api/admin/profile?seconds=1",
+            403
+        )
+        return success
+
+    def test_login_rate_limit(self):
+        """Test repeated logins for one account are cut off with 429 and Retry-After"""
+        email = f"ratelimit_{datetime.now().strftime('%H%M%S%f')}@example.com"
+        self.tests_run += 1
+        print("\n🔍 Testing Login Rate Limit...")
+        for attempt in range(1, 31):
+            response = requests.post(f"{self.base_url}/api/login", json={"email": email, "password": "wrongpassword"})
+            if response.status_code == 429:
+                if response.headers.get("Retry-After", "").isdigit():
+                    self.tests_passed += 1
+                    print(f"✅ Passed - 429 after {attempt - 1} attempts, Retry-After {response.headers['Retry-After']}s")
+                    return True
+                print(f"❌ Failed - 429 without a usable Retry-After: {response.headers.get('Retry-After')!r}")
+                return False
+            if response.status_code != 401:
+                print(f"❌ Failed - Expected 401 or 429, got {response.status_code}")
+                return False
+        print("❌ Failed - 30 bad logins for one account were never limited")
+        return False
+
     def test_unauthorized_access(self):
         """Test accessing protected endpoints without token"""
         # Temporarily remove token
@@ -250,6 +755,7 @@ class HabitMasterAPITester:
             ("Root Endpoint", self.test_root_endpoint),
             ("User Registration", self.test_register_user),
             ("User Login", self.test_login_user),
+            ("Refresh Session", self.test_refresh_session),
             ("Invalid Login", self.test_login_invalid_credentials),
             ("Unauthorized Access", self.test_unauthorized_access),
             ("Get Empty Habits", self.test_get_habits_empty),
@@ -258,6 +764,20 @@ class HabitMasterAPITester:
             ("Get Completed Habits", self.test_get_completed_habits),
             ("Complete Habit", self.test_complete_habit),
             ("Get Progress", self.test_get_progress),
+            ("Get Dashboard", self.test_get_dashboard),
+            ("Get Stats", self.test_get_stats),
+            ("Heatmap Report", self.test_heatmap_report),
+            ("Event Stream", self.test_event_stream),
+            ("Scheduled Days", self.test_unscheduled_habit_not_due),
+            ("Batch Endpoints", self.test_batch_endpoints),
+            ("Conditional GET", self.test_conditional_get_skips_habit_scan),
+            ("Prometheus Metrics", self.test_prometheus_metrics),
+            ("Admin Profiler", self.test_admin_profile_requires_admin),
+            ("Day Clock DST", self.test_day_clock_dst_boundaries),
+            ("Progress Cache", self.test_progress_cache_write_through),
+            ("Reminder Schedule", self.test_reminder_schedule),
+            ("Projected Payloads", self.test_projected_payloads),
+            ("Login Rate Limit", self.test_login_rate_limit),
         ]
         
         failed_tests = []
@@ -0,0 +1,106 @@
+"""Concurrent throughput of the HabitMaster data layer against a local mongod.
+
+Compares the old pattern (blocking pymongo calls inside ``async def``) with the
+Motor driver and the thread-offloaded sync fallback from ``backend/database.py``.
+
+    python benchmarks/async_db_benchmark.py --mongo-url mongodb://localhost:27017/habitmaster_bench
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from pymongo import MongoClient
+
+from database import create_database
+from repository import HabitRepository
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed(mongo_url, users, habits_per_user):
+    db = MongoClient(mongo_url).habitmaster
+    db.users.delete_many({"bench": True})
+    db.habits.delete_many({"bench": True})
+    emails = []
+    for i in range(users):
+        user_id = str(uuid.uuid4())
+        email = f"bench{i}@example.com"
+        emails.append((email, user_id))
+        db.users.insert_one({"id": user_id, "email": email, "username": f"bench{i}", "bench": True})
+        db.habits.insert_many([
+            {"id": str(uuid.uuid4()), "user_id": user_id, "name": f"habit {j}", "time": "07:00",
+             "days": ["mon"], "completed_dates": [], "bench": True}
+            for j in range(habits_per_user)
+        ])
+    return emails
+
+
+class BlockingRepository:
+    """The pre-refactor access pattern: pymongo called directly on the event loop."""
+
+    def __init__(self, mongo_url):
+        self.db = MongoClient(mongo_url).habitmaster
+
+    async def get_user_by_email(self, email):
+        return self.db.users.find_one({"email": email})
+
+    async def list_habits(self, user_id):
+        return list(self.db.habits.find({"user_id": user_id}))
+
+
+async def dashboard_request(repo, email, user_id, latencies):
+    start = time.perf_counter()
+    await repo.get_user_by_email(email)
+    await repo.list_habits(user_id)
+    latencies.append(time.perf_counter() - start)
+
+
+async def run(factory, emails, concurrency, rounds):
+    repo = factory()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        batch = [emails[i % len(emails)] for i in range(concurrency)]
+        await asyncio.gather(*(dashboard_request(repo, email, user_id, latencies) for email, user_id in batch))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017/habitmaster_bench")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--habits-per-user", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    emails = seed(args.mongo_url, args.users, args.habits_per_user)
+    variants = {
+        "blocking pymongo": lambda: BlockingRepository(args.mongo_url),
+        "motor": lambda: HabitRepository(create_database(args.mongo_url, driver="motor")),
+        "sync fallback (threads)": lambda: HabitRepository(create_database(args.mongo_url, driver="sync")),
+    }
+
+    print(f"{args.concurrency} concurrent dashboard loads x {args.rounds} rounds")
+    for name, factory in variants.items():
+        stats = asyncio.run(run(factory, emails, args.concurrency, args.rounds))
+        print(f"{name:<26} {stats['throughput_rps']:>9.1f} req/s  "
+              f"p50 {stats['p50_ms']:>7.2f} ms  p99 {stats['p99_ms']:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
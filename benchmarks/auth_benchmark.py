@@ -0,0 +1,74 @@
+"""Authentication CPU: per-request token checks and session renewal per active user.
+
+Per request, compares verifying the bearer token with ``jwt.decode`` every
+time (before) against a TokenCache hit (after). Per active user per day,
+compares renewing an expired access token by logging in again - one bcrypt
+verify every JWT_EXPIRE_MINUTES of activity - against exchanging a refresh
+token, with one real login per refresh-token lifetime.
+
+    python benchmarks/auth_benchmark.py [--rounds 12] [--active-hours 8]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+import bcrypt
+
+from tokens import ACCESS, REFRESH, TokenCache, decode_token, encode_token
+
+SECRET = "benchmark-secret-at-least-32-bytes"
+ALGORITHM = "HS256"
+
+
+def per_call_us(fn, iterations):
+    began = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - began) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--expire-minutes", type=int, default=30, help="JWT_EXPIRE_MINUTES")
+    parser.add_argument("--refresh-days", type=int, default=30, help="JWT_REFRESH_EXPIRE_DAYS")
+    parser.add_argument("--active-hours", type=float, default=8.0, help="hours a user keeps the app in use per day")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = {"sub": "user@example.com", "uid": "user-1", "username": "user", "tz": "UTC"}
+    access = encode_token(claims, ACCESS, timedelta(minutes=args.expire_minutes), SECRET, ALGORITHM)
+    refresh = encode_token({"sub": claims["sub"]}, REFRESH, timedelta(days=args.refresh_days), SECRET, ALGORITHM)
+    cache = TokenCache()
+    decode_token(access, ACCESS, SECRET, ALGORITHM, cache=cache)
+
+    decode_us = per_call_us(lambda: decode_token(access, ACCESS, SECRET, ALGORITHM), args.iterations)
+    cached_us = per_call_us(lambda: decode_token(access, ACCESS, SECRET, ALGORITHM, cache=cache), args.iterations)
+    print("per request token check:")
+    print(f"  jwt.decode      {decode_us:8.1f} us")
+    print(f"  cache hit       {cached_us:8.1f} us  ({decode_us / cached_us:.0f}x)")
+
+    hashed = bcrypt.hashpw(b"password", bcrypt.gensalt(rounds=args.rounds))
+    login_ms = per_call_us(lambda: bcrypt.checkpw(b"password", hashed), 5) / 1000
+
+    def exchange():
+        decode_token(refresh, REFRESH, SECRET, ALGORITHM)
+        encode_token(claims, ACCESS, timedelta(minutes=args.expire_minutes), SECRET, ALGORITHM)
+        encode_token({"sub": claims["sub"]}, REFRESH, timedelta(days=args.refresh_days), SECRET, ALGORITHM)
+
+    refresh_ms = per_call_us(exchange, args.iterations // 10) / 1000
+
+    renewals = args.active_hours * 60 / args.expire_minutes
+    before_ms = renewals * login_ms
+    after_ms = renewals * refresh_ms + login_ms / args.refresh_days
+    print(f"session renewal per active user per day ({renewals:.0f} renewals, bcrypt rounds {args.rounds}):")
+    print(f"  login           {login_ms:8.2f} ms each  {before_ms:9.2f} ms/day")
+    print(f"  refresh         {refresh_ms:8.3f} ms each  {after_ms:9.2f} ms/day  ({before_ms / after_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cold-start timing for the Vercel serverless functions under api/.
+
+Each sample runs a fresh interpreter that imports one function module, serves
+a first (cold) request and then a second (warm) request through the ASGI app,
+so connection pool setup and TLS handshakes land in the cold number and
+client reuse shows up in the warm one. Run it on two revisions to compare.
+
+    python benchmarks/cold_start_benchmark.py --mongo-url mongodb://localhost:27017/habitmaster_bench
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import uuid
+
+import bcrypt
+import jwt
+from pymongo import MongoClient
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+
+EMAIL = "cold-start-bench@example.com"
+PASSWORD = "cold-start-pass"
+
+# function -> (method, body)
+FUNCTIONS = {
+    "register": ("POST", {"username": "bench", "email": "{unique}@example.com", "dob": "1990-01-01", "password": PASSWORD}),
+    "login": ("POST", {"email": EMAIL, "password": PASSWORD}),
+    "habits": ("GET", None),
+    "completed-habits": ("GET", None),
+    "progress": ("GET", None),
+    "dashboard": ("GET", None),
+    "complete-habit": ("POST", {"habit_id": "missing"}),
+}
+
+SAMPLE = r"""
+import importlib.util, json, sys, time, uuid
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("fn", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+client = TestClient(module.app)
+method, body, token = sys.argv[2], json.loads(sys.argv[3]), sys.argv[4]
+headers = {"Authorization": f"Bearer {token}"}
+
+def call():
+    payload = json.loads(json.dumps(body).replace("{unique}", uuid.uuid4().hex)) if body else None
+    t = time.perf_counter()
+    client.request(method, "/", json=payload, headers=headers)
+    return time.perf_counter() - t
+
+cold = call()
+warm = call()
+print(json.dumps({"import_ms": (imported - start) * 1000, "cold_ms": cold * 1000, "warm_ms": warm * 1000}))
+"""
+
+
+def seed_user(mongo_url):
+    users = MongoClient(mongo_url).habitmaster.users
+    if not users.find_one({"email": EMAIL}):
+        users.insert_one({
+            "id": str(uuid.uuid4()), "username": "bench", "email": EMAIL, "dob": "1990-01-01",
+            "password": bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8"),
+        })
+
+
+def sample(name, mongo_url, token):
+    method, body = FUNCTIONS[name]
+    env = {**os.environ, "MONGODB_URI": mongo_url}
+    output = subprocess.run(
+        [sys.executable, "-c", SAMPLE, os.path.join(API_DIR, f"{name}.py"), method, json.dumps(body), token],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017/habitmaster_bench")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--functions", nargs="+", default=list(FUNCTIONS))
+    args = parser.parse_args()
+
+    seed_user(args.mongo_url)
+    token = jwt.encode({"sub": EMAIL}, os.getenv("JWT_SECRET", "your-secret-key"), algorithm="HS256")
+
+    print(f"median of {args.samples} fresh processes")
+    print(f"{'function':<18} {'import ms':>10} {'cold req ms':>12} {'warm req ms':>12}")
+    results = {}
+    for name in args.functions:
+        runs = [sample(name, args.mongo_url, token) for _ in range(args.samples)]
+        results[name] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        r = results[name]
+        print(f"{name:<18} {r['import_ms']:>10.1f} {r['cold_ms']:>12.1f} {r['warm_ms']:>12.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
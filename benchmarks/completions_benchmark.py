@@ -0,0 +1,102 @@
+"""Legacy completed_dates arrays vs per-month completion bitmasks.
+
+Reports document size, "completed on X" checks and 30-day range queries for
+habits with multi-year history. With --mongo-url it also times the
+``$addToSet`` and ``$bit`` writes against a local mongod.
+
+    python benchmarks/completions_benchmark.py [--mongo-url mongodb://localhost:27017/habitmaster_bench]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+import bson
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from completions import DAY_FORMAT, completed_days, encode_dates, is_completed, mark_update
+
+
+def history(years, rate=0.8, seed=42):
+    rng = random.Random(seed)
+    today = date.today()
+    # Starts yesterday, so checking today is the common "not done yet" case
+    return [today - timedelta(days=d) for d in range(1, years * 365 + 1) if rng.random() < rate]
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def compare_in_memory(years, repeat):
+    days = history(years)
+    legacy = {"completed_dates": [d.strftime(DAY_FORMAT) for d in days]}
+    compact = {"completions": encode_dates(days)}
+    today = date.today()
+    today_key = today.strftime(DAY_FORMAT)
+    month_ago = today - timedelta(days=30)
+    month_ago_key = month_ago.strftime(DAY_FORMAT)
+
+    def legacy_range():
+        return [d for d in legacy["completed_dates"] if month_ago_key <= d <= today_key]
+
+    return {
+        "legacy_bytes": len(bson.encode(legacy)),
+        "compact_bytes": len(bson.encode(compact)),
+        "legacy_check_us": timeit(lambda: today_key in legacy["completed_dates"], repeat),
+        "compact_check_us": timeit(lambda: is_completed(compact, today), repeat),
+        "legacy_range_us": timeit(legacy_range, repeat),
+        "compact_range_us": timeit(lambda: completed_days(compact, month_ago, today), repeat),
+    }
+
+
+def compare_writes(mongo_url, years, repeat):
+    from pymongo import MongoClient
+
+    habits = MongoClient(mongo_url).habitmaster.habits
+    days = history(years)
+    legacy_id, compact_id = str(uuid.uuid4()), str(uuid.uuid4())
+    habits.insert_many([
+        {"id": legacy_id, "completed_dates": [d.strftime(DAY_FORMAT) for d in days]},
+        {"id": compact_id, "completions": encode_dates(days)},
+    ])
+    today = date.today().strftime(DAY_FORMAT)
+    try:
+        return {
+            "addToSet_us": timeit(lambda: habits.update_one({"id": legacy_id}, {"$addToSet": {"completed_dates": today}}), repeat),
+            "bit_us": timeit(lambda: habits.update_one({"id": compact_id}, mark_update(today)), repeat),
+        }
+    finally:
+        habits.delete_many({"id": {"$in": [legacy_id, compact_id]}})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--mongo-url")
+    args = parser.parse_args()
+
+    print(f"{'years':>5} {'array B':>9} {'bitmask B':>9} {'check us':>17} {'30d range us':>19}")
+    for years in args.years:
+        r = compare_in_memory(years, args.repeat)
+        print(f"{years:>5} {r['legacy_bytes']:>9} {r['compact_bytes']:>9} "
+              f"{r['legacy_check_us']:>8.2f} -> {r['compact_check_us']:<6.2f} "
+              f"{r['legacy_range_us']:>9.2f} -> {r['compact_range_us']:<6.2f}")
+
+    if args.mongo_url:
+        print("\nwrite latency on a local mongod")
+        for years in args.years:
+            r = compare_writes(args.mongo_url, years, min(args.repeat, 500))
+            print(f"{years:>5} years  $addToSet {r['addToSet_us']:>8.1f} us   $bit {r['bit_us']:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
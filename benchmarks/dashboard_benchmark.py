@@ -0,0 +1,104 @@
+"""Dashboard load: three list endpoints vs the aggregated /api/dashboard.
+
+Counts HTTP requests, MongoDB round trips (via pymongo command monitoring) and
+bytes transferred on both hops against a local mongod.
+
+    python benchmarks/dashboard_benchmark.py --mongo-url mongodb://localhost:27017/habitmaster_bench
+"""
+import argparse
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+import bson
+from pymongo import MongoClient, monitoring
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.commands = 0
+        self.request_bytes = 0
+        self.reply_bytes = 0
+
+    def started(self, event):
+        self.commands += 1
+        self.request_bytes += len(bson.encode(event.command))
+
+    def succeeded(self, event):
+        self.reply_bytes += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+
+def seed_history(mongo_url, email, user_id, habits, history_days):
+    db = MongoClient(mongo_url).habitmaster
+    db.habits.delete_many({"user_id": user_id})
+    today = datetime.now()
+    dates = [(today - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(history_days)]
+    db.habits.insert_many([
+        {"id": str(uuid.uuid4()), "user_id": user_id, "name": f"habit {i}", "time": "07:00",
+         "days": ["mon", "wed", "fri"], "created_at": today, "completed_dates": dates[i % 2:]}
+        for i in range(habits)
+    ])
+
+
+def measure(client, counter, headers, paths, repeat):
+    counter.reset()
+    http_bytes = 0
+    for _ in range(repeat):
+        for path in paths:
+            response = client.get(path, headers=headers)
+            response.raise_for_status()
+            http_bytes += len(response.content)
+    return {
+        "http_requests": len(paths),
+        "db_round_trips": counter.commands / repeat,
+        "db_reply_bytes": counter.reply_bytes / repeat,
+        "http_response_bytes": http_bytes / repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017/habitmaster_bench")
+    parser.add_argument("--habits", type=int, default=20)
+    parser.add_argument("--history-days", type=int, default=730)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    counter = CommandCounter()
+    monitoring.register(counter)
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ.pop("MONGODB_URI", None)
+
+    from fastapi.testclient import TestClient
+    import server
+
+    email = f"dashboard-bench-{uuid.uuid4().hex[:8]}@example.com"
+    with TestClient(server.app) as client:
+        client.post("/api/register", json={"username": "bench", "email": email, "dob": "1990-01-01", "password": "bench-pass"})
+        login = client.post("/api/login", json={"email": email, "password": "bench-pass"}).json()
+        headers = {"Authorization": f"Bearer {login['access_token']}"}
+        seed_history(args.mongo_url, email, login["user"]["id"], args.habits, args.history_days)
+        client.get("/api/dashboard", headers=headers)  # warm the user cache
+
+        results = {
+            "three endpoints": measure(client, counter, headers, ["/api/habits", "/api/completed-habits", "/api/progress"], args.repeat),
+            "/api/dashboard": measure(client, counter, headers, ["/api/dashboard"], args.repeat),
+        }
+
+    print(f"{args.habits} habits x {args.history_days} days of history, per dashboard load:")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
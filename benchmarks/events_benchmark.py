@@ -0,0 +1,83 @@
+"""Idle-connection cost and fan-out latency of the dashboard event hub.
+
+Opens N subscriptions, each with a task parked in ``Subscription.next`` the
+way the SSE endpoint waits between heartbeats, and reports memory per idle
+connection. Then publishes to random users and reports the cost per publish
+and the time until every receiving connection has its frame.
+
+    python benchmarks/events_benchmark.py [--connections 10000 50000] [--broker local]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from events import EventHub, LocalBroker, habits_completed
+
+
+async def run(connections: int, per_user: int, publishes: int, broker: str):
+    hub = EventHub(LocalBroker() if broker == "local" else None)
+    await hub.start()
+    users = max(connections // per_user, 1)
+    received = asyncio.Queue()
+
+    async def connection(subscription):
+        while True:
+            frame = await subscription.next(3600)
+            if frame is not None:
+                received.put_nowait(time.perf_counter())
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [
+        asyncio.create_task(connection(hub.subscribe(f"user-{i % users}")))
+        for i in range(connections)
+    ]
+    await asyncio.sleep(0.1)
+    idle_bytes = (tracemalloc.get_traced_memory()[0] - before) / connections
+    tracemalloc.stop()
+
+    rng = random.Random(1)
+    publish_s = 0.0
+    latencies = []
+    for version in range(publishes):
+        began = time.perf_counter()
+        await hub.publish(f"user-{rng.randrange(users)}", habits_completed(version, "2026-01-05", ["habit-1"]))
+        publish_s += time.perf_counter() - began
+        for _ in range(per_user):
+            latencies.append(await received.get() - began)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await hub.stop()
+    latencies.sort()
+    return {
+        "idle_kb": idle_bytes / 1024,
+        "publish_us": publish_s / publishes * 1e6,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--per-user", type=int, default=2, help="open connections per user (phone, laptop)")
+    parser.add_argument("--publishes", type=int, default=2000)
+    parser.add_argument("--broker", choices=("none", "local"), default="none")
+    args = parser.parse_args()
+
+    print(f"{'connections':>11} {'KB/idle conn':>12} {'publish us':>10} {'deliver p50 us':>14} {'p99 us':>8}")
+    for connections in args.connections:
+        r = asyncio.run(run(connections, args.per_user, args.publishes, args.broker))
+        print(f"{connections:>11} {r['idle_kb']:>12.2f} {r['publish_us']:>10.1f} {r['p50_us']:>14.1f} {r['p99_us']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Import cost of each Vercel function and the Railway server.
+
+Imports every entry point in a fresh interpreter under ``python -X importtime``
+and reports the cumulative import time of its top-level modules, plus which
+of the heavy optional modules it pulled in. ``--baseline`` runs the same
+measurement against another revision (extracted with ``git archive``) for a
+side-by-side comparison.
+
+FastAPI and pydantic account for most of every entry point's time (around a
+second here, email_validator included), so the totals barely move between
+revisions. What the shared package controls is the heavy-modules column:
+bcrypt only in the auth functions, NumPy and Motor in none at import.
+
+    python benchmarks/import_time_benchmark.py [--runs 5] [--baseline HEAD~1]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+ENTRY_POINTS = [
+    "api/register.py", "api/login.py", "api/refresh.py", "api/habits.py", "api/completed-habits.py",
+    "api/dashboard.py", "api/progress.py", "api/complete-habit.py", "api/habits-batch.py",
+    "api/complete-habits-batch.py", "api/reports/heatmap.py",
+    "api/main.py",
+    "backend/server.py",
+]
+HEAVY_MODULES = ("bcrypt", "numpy", "motor", "email_validator", "dotenv")
+
+PROBE = """
+import importlib.util, sys
+sys.path.insert(0, {backend!r})
+spec = importlib.util.spec_from_file_location("entry", {path!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print("HEAVY", ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(tree: str, entry: str):
+    """``(import ms, heavy modules loaded)`` for one entry point, or None if it cannot be imported."""
+    path = os.path.join(tree, entry)
+    if not os.path.exists(path):
+        return None
+    code = PROBE.format(backend=os.path.join(tree, "backend"), path=path, heavy=HEAVY_MODULES)
+    env = {**os.environ, "MONGO_URL": os.getenv("MONGO_URL", "mongodb://127.0.0.1:1")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=tree, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"; top-level modules are not indented
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  ") and cumulative.strip().isdigit():
+            total_us += int(cumulative)
+    heavy = next((line[6:] for line in result.stdout.splitlines() if line.startswith("HEAVY ")), "")
+    return total_us / 1000, heavy
+
+
+def median_run(tree: str, entry: str, runs: int):
+    samples = [measure(tree, entry) for _ in range(runs)]
+    if any(sample is None for sample in samples):
+        return None
+    return statistics.median(ms for ms, _ in samples), samples[0][1]
+
+
+def extract(rev: str, into: str) -> str:
+    archive = os.path.join(into, "tree.tar")
+    subprocess.run(["git", "archive", "-o", archive, rev, "api", "backend"], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(into)
+    return into
+
+
+def fmt(result):
+    if result is None:
+        return f"{'-':>9} {'':<28}"
+    ms, heavy = result
+    return f"{ms:>9.1f} {heavy or '-':<28}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", help="git revision to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        baseline = extract(args.baseline, scratch) if args.baseline else None
+        header = f"{'entry point':<30} {'ms':>9} {'heavy modules':<28}"
+        if baseline:
+            header += f" {'base ms':>9} {'base heavy modules':<28}"
+        print(header)
+        for entry in ENTRY_POINTS:
+            line = f"{entry:<30} {fmt(median_run(ROOT, entry, args.runs))}"
+            if baseline:
+                line += f" {fmt(median_run(baseline, entry, args.runs))}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
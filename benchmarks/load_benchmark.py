@@ -0,0 +1,217 @@
+"""Concurrent load test replaying the backend_test.py flows with N virtual users.
+
+Each virtual user registers, logs in, then repeats create habit -> complete
+habit -> progress until its iterations (or the run's duration) are used up.
+Reports throughput, latency percentiles and a histogram per route, and error
+rates; ``--json`` writes the report so runs can be compared, and
+``--compare`` prints the p50/p95/p99 change against an earlier report.
+
+Run it against a local server backed by a local mongod (needs httpx), with
+the login/registration rate limits off since every user comes from one address:
+
+    cd backend && RATE_LIMIT_ENABLED=false uvicorn server:app --port 8001 --workers 4
+    python benchmarks/load_benchmark.py --users 50 --iterations 20 --json run.json \\
+        --mongo-url mongodb://localhost:27017/habitmaster
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+
+    async def call(self, client, method, route, expected, **kwargs):
+        """One request; returns the JSON body, or None if it failed."""
+        key = f"{method} {route}"
+        began = time.perf_counter()
+        try:
+            response = await client.request(method, route, **kwargs)
+        except httpx.HTTPError as exc:
+            self.latencies[key].append(time.perf_counter() - began)
+            self.statuses[key][type(exc).__name__] += 1
+            self.errors[key] += 1
+            return None
+        self.latencies[key].append(time.perf_counter() - began)
+        self.statuses[key][str(response.status_code)] += 1
+        if response.status_code != expected:
+            self.errors[key] += 1
+            return None
+        return response.json()
+
+
+async def virtual_user(client, recorder, run_id, index, iterations, deadline):
+    email = f"loadtest-{run_id}-{index}@example.com"
+    registered = await recorder.call(client, "POST", "/api/register", 200, json={
+        "username": f"loadtest{index}", "email": email, "dob": "1990-01-01", "password": "testpass123",
+    })
+    if registered is None:
+        return
+    login = await recorder.call(client, "POST", "/api/login", 200, json={"email": email, "password": "testpass123"})
+    if login is None:
+        return
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+
+    for iteration in range(iterations):
+        if time.monotonic() >= deadline:
+            return
+        created = await recorder.call(client, "POST", "/api/habits", 200, headers=headers, json={
+            "name": f"Habit {iteration}", "time": "07:00", "days": [],
+        })
+        if created is not None:
+            await recorder.call(client, "POST", "/api/complete-habit", 200, headers=headers,
+                                json={"habit_id": created["habit_id"]})
+        await recorder.call(client, "GET", "/api/progress", 200, headers=headers)
+
+
+def percentile(ordered, fraction):
+    # Nearest rank
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(recorder, elapsed):
+    routes = {}
+    for key, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(sample * 1000 for sample in samples)
+        histogram = [0] * (len(BUCKETS_MS) + 1)
+        for ms in ordered:
+            histogram[next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))] += 1
+        routes[key] = {
+            "requests": len(ordered),
+            "throughput_rps": len(ordered) / elapsed,
+            "errors": recorder.errors[key],
+            "error_rate": recorder.errors[key] / len(ordered),
+            "statuses": dict(recorder.statuses[key]),
+            "latency_ms": {
+                "mean": sum(ordered) / len(ordered),
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1],
+            },
+            "histogram_ms": {
+                **{f"<={bound}": count for bound, count in zip(BUCKETS_MS, histogram)},
+                f">{BUCKETS_MS[-1]}": histogram[-1],
+            },
+        }
+    total = sum(route["requests"] for route in routes.values())
+    errors = sum(route["errors"] for route in routes.values())
+    return {
+        "elapsed_s": elapsed,
+        "requests": total,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "routes": routes,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def cleanup(mongo_url, run_id):
+    from pymongo import MongoClient
+
+    db = MongoClient(mongo_url).get_default_database("habitmaster")
+    user_ids = [user["id"] for user in db.users.find({"email": {"$regex": f"^loadtest-{run_id}-"}}, {"id": 1})]
+    db.habits.delete_many({"user_id": {"$in": user_ids}})
+    db.users.delete_many({"id": {"$in": user_ids}})
+    return len(user_ids)
+
+
+def print_report(report, baseline=None):
+    print(f"{report['requests']} requests in {report['elapsed_s']:.1f} s: "
+          f"{report['throughput_rps']:.1f} req/s, error rate {report['error_rate']:.2%}")
+    header = f"{'route':<26} {'reqs':>6} {'req/s':>8} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    if baseline:
+        header += f" {'p50 d%':>7} {'p95 d%':>7} {'p99 d%':>7}"
+    print(header)
+    for key, route in report["routes"].items():
+        latency = route["latency_ms"]
+        line = (f"{key:<26} {route['requests']:>6} {route['throughput_rps']:>8.1f} {route['error_rate'] * 100:>6.1f} "
+                f"{latency['p50']:>8.1f} {latency['p95']:>8.1f} {latency['p99']:>8.1f} {latency['max']:>8.1f}")
+        before = baseline["routes"].get(key) if baseline else None
+        if before:
+            line += "".join(
+                f" {(latency[p] / before['latency_ms'][p] - 1) * 100:>+7.1f}" for p in ("p50", "p95", "p99")
+            )
+        print(line)
+
+
+async def run(args):
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        began = time.monotonic()
+        deadline = began + args.duration if args.duration else float("inf")
+        tasks = []
+        for index in range(args.users):
+            tasks.append(asyncio.create_task(
+                virtual_user(client, recorder, run_id, index, args.iterations, deadline)
+            ))
+            if args.ramp_up:
+                await asyncio.sleep(args.ramp_up / args.users)
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - began
+    return run_id, summarize(recorder, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("REACT_APP_BACKEND_URL", "http://localhost:8001"))
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=10, help="create/complete/progress rounds per user")
+    parser.add_argument("--duration", type=float, default=0, help="stop starting new rounds after this many seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="seconds over which to start the users")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--json", help="write the report here")
+    parser.add_argument("--compare", help="earlier --json report to compare latencies against")
+    parser.add_argument("--mongo-url", help="delete the run's users and habits from this database afterwards")
+    args = parser.parse_args()
+
+    started_at = datetime.utcnow().isoformat() + "Z"
+    run_id, report = asyncio.run(run(args))
+    report = {
+        "run_id": run_id,
+        "started_at": started_at,
+        "revision": git_revision(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "compare", "mongo_url")},
+        **report,
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.mongo_url:
+        print(f"removed {cleanup(args.mongo_url, run_id)} load-test users")
+    return 1 if report["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
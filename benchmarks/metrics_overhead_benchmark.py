@@ -0,0 +1,91 @@
+"""Per-request cost of the metrics middleware and per-command cost of the Mongo listener.
+
+Drives a one-route FastAPI app directly over ASGI (no sockets, so the
+framework is the only other cost) with and without MetricsMiddleware, and
+reports the added microseconds per request. Also times one Mongo command
+observation and one /metrics render with a realistic number of series.
+
+    python benchmarks/metrics_overhead_benchmark.py [--requests 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from fastapi import FastAPI
+
+from instrumentation import Instrumentation, MetricsMiddleware
+
+SCOPE = {
+    "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+    "path": "/api/progress", "raw_path": b"/api/progress", "query_string": b"", "root_path": "",
+    "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+}
+
+
+def build_app(instrumentation=None):
+    app = FastAPI()
+
+    @app.get("/api/progress")
+    async def progress():
+        return {"total_habits": 3, "completed_today": 1, "progress_percentage": 33.3}
+
+    if instrumentation is not None:
+        app.add_middleware(MetricsMiddleware, instrumentation=instrumentation)
+    return app
+
+
+async def drive(app, requests):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(SCOPE), receive, send)
+    began = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return (time.perf_counter() - began) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5, help="alternating runs; the best of each is kept")
+    args = parser.parse_args()
+
+    instrumentation = Instrumentation()
+    plain, instrumented = build_app(), build_app(instrumentation)
+    bare_us = min(asyncio.run(drive(plain, args.requests)) for _ in range(args.rounds))
+    with_us = min(asyncio.run(drive(instrumented, args.requests)) for _ in range(args.rounds))
+    print(f"request without middleware {bare_us:8.1f} us")
+    print(f"request with middleware    {with_us:8.1f} us  (+{with_us - bare_us:.1f} us, {with_us / bare_us - 1:+.1%})")
+
+    event = SimpleNamespace(duration_micros=850, command_name="find")
+    listener = instrumentation.mongo_listener
+    began = time.perf_counter()
+    for _ in range(args.requests):
+        listener.succeeded(event)
+    print(f"mongo command observation  {(time.perf_counter() - began) / args.requests * 1e6:8.2f} us")
+
+    # ~40 routes x 3 statuses x 2 methods, a dozen Mongo commands
+    for i in range(40):
+        for status in ("200", "401", "404"):
+            instrumentation.requests.observe(0.01, "GET", f"/api/route{i}", status)
+            instrumentation.requests.observe(0.01, "POST", f"/api/route{i}", status)
+    for command in ("find", "insert", "update", "aggregate", "findAndModify", "delete", "getMore",
+                    "count", "createIndexes", "listIndexes", "ping", "hello"):
+        instrumentation.mongo.observe(0.001, command, "ok")
+    began = time.perf_counter()
+    body = instrumentation.render()
+    print(f"/metrics render            {(time.perf_counter() - began) * 1000:8.2f} ms  ({len(body) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Slowdown of a busy worker while the sampling profiler runs.
+
+Runs a CPU-bound pure-Python workload (JSON round trips of habit-like
+documents, on the main thread, with idle worker threads alongside like a
+server's pools) without the profiler and with it sampling at several
+intervals. Reports the CPU the sampling thread used as a share of the run
+(its direct cost) and the workload's throughput change, alternating runs
+and keeping the best of each since wall-clock throughput is noisy.
+
+    python benchmarks/profiler_overhead_benchmark.py [--seconds 2] [--rounds 3]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from profiler import Sampler
+
+DOC = {"id": "habit-1", "name": "Read", "time": "07:00", "days": ["mon", "wed", "fri"],
+       "completions": {str(year): list(range(12)) for year in range(2020, 2026)}}
+
+
+def workload(seconds):
+    """Iterations completed in ``seconds`` of wall time."""
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            json.loads(json.dumps(DOC))
+        done += 100
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--idle-threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    for i in range(args.idle_threads):
+        threading.Thread(target=stop.wait, name=f"idle-{i}", daemon=True).start()
+
+    intervals = (0.01, 0.005, 0.001)
+    baseline = 0
+    best = {interval: (0, None) for interval in intervals}
+    for _ in range(args.rounds):
+        baseline = max(baseline, workload(args.seconds))
+        for interval in intervals:
+            sampler = Sampler(interval).start()
+            done = workload(args.seconds)
+            profile = sampler.stop()
+            if done > best[interval][0]:
+                best[interval] = (done, profile)
+    stop.set()
+
+    print(f"{'interval':>9} {'iterations':>11} {'slowdown':>9} {'samples':>8} {'sampler cpu':>12}")
+    print(f"{'off':>9} {baseline:>11}")
+    for interval, (done, profile) in best.items():
+        print(f"{interval * 1000:>7g}ms {done:>11} {1 - done / baseline:>9.1%} {profile.samples:>8} "
+              f"{profile.sampler_cpu / profile.duration:>12.2%}")
+
+
+if __name__ == "__main__":
+    main()
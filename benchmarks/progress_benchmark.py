@@ -0,0 +1,70 @@
+"""Progress counting: Mongo aggregation pipeline vs Python over projected habits.
+
+    python benchmarks/progress_benchmark.py --mongo-url mongodb://localhost:27017/habitmaster_bench
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from pymongo import MongoClient
+
+from completions import encode_dates
+from database import create_database
+from repository import HabitRepository
+
+
+def seed(mongo_url, habits, history_days=365):
+    db = MongoClient(mongo_url).habitmaster
+    user_id = str(uuid.uuid4())
+    today = date.today()
+    db.habits.insert_many([
+        {"id": str(uuid.uuid4()), "user_id": user_id, "name": f"habit {i}", "time": "07:00", "days": ["mon"],
+         "completions": encode_dates(today - timedelta(days=d) for d in range(i % 2, history_days, 2))}
+        for i in range(habits)
+    ])
+    return db, user_id
+
+
+async def time_counts(repo, user_id, day, repeat):
+    await repo.count_progress(user_id, day)  # warm up the connection pool
+    start = time.perf_counter()
+    for _ in range(repeat):
+        counts = await repo.count_progress(user_id, day)
+    return (time.perf_counter() - start) / repeat * 1000, counts
+
+
+async def run(mongo_url, sizes, repeat):
+    today = date.today().strftime("%Y-%m-%d")
+    database = create_database(mongo_url)
+    pipeline = HabitRepository(database, use_aggregation=True)
+    python = HabitRepository(database, use_aggregation=False)
+
+    print(f"{'habits':>7} {'aggregation ms':>15} {'python ms':>10} {'speedup':>8}")
+    for habits in sizes:
+        db, user_id = seed(mongo_url, habits)
+        try:
+            agg_ms, agg_counts = await time_counts(pipeline, user_id, today, repeat)
+            py_ms, py_counts = await time_counts(python, user_id, today, repeat)
+            assert agg_counts == py_counts, (agg_counts, py_counts)
+            print(f"{habits:>7} {agg_ms:>15.2f} {py_ms:>10.2f} {py_ms / agg_ms:>7.1f}x")
+        finally:
+            db.habits.delete_many({"user_id": user_id})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017/habitmaster_bench")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.mongo_url, args.sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
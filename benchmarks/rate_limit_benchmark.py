@@ -0,0 +1,98 @@
+"""Cost of turning away an over-limit login, against the bcrypt verify it avoids.
+
+Drives POST /api/login on the full app directly over ASGI (no sockets) for an
+account whose bucket is already empty, so every request is answered 429
+without touching MongoDB, and times one limiter check on its own. For scale,
+also times a bcrypt verify at BCRYPT_ROUNDS (default 12), which is what each
+of those attempts would otherwise cost a worker.
+
+    python benchmarks/rate_limit_benchmark.py [--requests 5000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+import bcrypt
+
+from habitmaster import state
+from habitmaster.app import create_app
+from rate_limit import RateLimited
+
+BODY = json.dumps({"email": "bench@example.com", "password": "wrong-password"}).encode()
+SCOPE = {
+    "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+    "path": "/api/login", "raw_path": b"/api/login", "query_string": b"", "root_path": "",
+    "headers": [(b"host", b"localhost"), (b"content-type", b"application/json"),
+                (b"content-length", str(len(BODY)).encode())],
+    "client": ("127.0.0.1", 1), "server": ("localhost", 80),
+}
+
+
+async def drive(app, requests):
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    # Empty the account's bucket first, without going through the handler (which would query MongoDB)
+    limiter = state.rate_limiter.resolve()
+    try:
+        while True:
+            await limiter.check("login", email="bench@example.com")
+    except RateLimited:
+        pass
+    for _ in range(100):
+        await app(dict(SCOPE), receive, send)
+    statuses.clear()
+    began = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    elapsed = (time.perf_counter() - began) / requests * 1e6
+    assert set(statuses) == {429}, set(statuses)
+    return elapsed
+
+
+async def check_cost(requests):
+    limiter = state.rate_limiter.resolve()
+    began = time.perf_counter()
+    for i in range(requests):
+        try:
+            await limiter.check("login", ip="10.0.0.1", email=f"user{i % 1000}@example.com")
+        except RateLimited:
+            pass
+    return (time.perf_counter() - began) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = create_app(background=False)
+    rejected_us = asyncio.run(drive(app, args.requests))
+    check_us = asyncio.run(check_cost(args.requests))
+
+    rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    hashed = bcrypt.hashpw(b"password", bcrypt.gensalt(rounds=rounds))
+    began = time.perf_counter()
+    bcrypt.checkpw(b"wrong-password", hashed)
+    verify_us = (time.perf_counter() - began) * 1e6
+
+    print(f"429 login over ASGI        {rejected_us:10.1f} us")
+    print(f"limiter check (local)      {check_us:10.1f} us")
+    print(f"bcrypt verify (rounds {rounds}) {verify_us:10.1f} us  ({verify_us / rejected_us:.0f}x a rejection)")
+
+
+if __name__ == "__main__":
+    main()
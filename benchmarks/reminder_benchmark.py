@@ -0,0 +1,109 @@
+"""Reminder scheduling overhead per 100k habits.
+
+Loads synthetic habits (random times, weekday schedules and timezones) into
+a ReminderScheduler, then replays a simulated day minute by minute, popping
+and rescheduling every reminder that fires. Reports load time, incremental
+upsert / timezone-change cost, CPU per simulated day and heap memory.
+
+    python benchmarks/reminder_benchmark.py [--habits 100000 300000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from reminders import ReminderScheduler
+from schedule import WEEKDAYS, normalize_days
+
+TIMEZONES = ["UTC", "America/New_York", "America/Los_Angeles", "Europe/London", "Europe/Berlin",
+             "Asia/Kolkata", "Asia/Tokyo", "Australia/Sydney", "America/Sao_Paulo", "Pacific/Auckland"]
+
+
+def synthetic(count, seed=42):
+    rng = random.Random(seed)
+    users = max(count // 5, 1)
+    timezones = {f"user-{u}": rng.choice(TIMEZONES) for u in range(users)}
+    habits = []
+    for i in range(count):
+        days, mask = normalize_days(rng.sample(WEEKDAYS, rng.randint(1, 7)))
+        habits.append({
+            "id": f"habit-{i}",
+            "user_id": f"user-{rng.randrange(users)}",
+            "name": "habit",
+            "time": f"{rng.randrange(24):02d}:{rng.choice((0, 15, 30, 45)):02d}",
+            "days": days,
+            "day_mask": mask,
+        })
+    return habits, timezones
+
+
+def run(count, batch_size):
+    habits, timezones = synthetic(count)
+    now = time.time()
+    scheduler = ReminderScheduler()
+
+    began = time.process_time()
+    scheduler.load(habits, timezones, now)
+    load_s = time.process_time() - began
+
+    # Measured on a second load; tracing slows the timed one down severalfold
+    tracemalloc.start()
+    traced = ReminderScheduler()
+    traced.load(habits, timezones, now)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    extra = synthetic(1000, seed=7)[0]
+    began = time.process_time()
+    for habit in extra:
+        scheduler.upsert({**habit, "id": "new-" + habit["id"]}, now)
+    upsert_us = (time.process_time() - began) / len(extra) * 1e6
+
+    users = list(timezones)[:1000]
+    began = time.process_time()
+    for user_id in users:
+        scheduler.set_timezone(user_id, "Asia/Tokyo", now)
+    tz_us = (time.process_time() - began) / len(users) * 1e6
+
+    fired = 0
+    began = time.process_time()
+    for minute in range(1, 24 * 60 + 1):
+        while True:
+            due = scheduler.pop_due(now + minute * 60, batch_size)
+            fired += len(due)
+            if len(due) < batch_size:
+                break
+    day_s = time.process_time() - began
+
+    per_100k = 100000 / count
+    return {
+        "load_s": load_s * per_100k,
+        "upsert_us": upsert_us,
+        "tz_change_us": tz_us,
+        "fired": fired,
+        "day_cpu_s": day_s * per_100k,
+        "fire_us": day_s / max(fired, 1) * 1e6,
+        "memory_mb": memory / 1e6 * per_100k,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--habits", type=int, nargs="+", default=[100000])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("per 100k habits:")
+    print(f"{'habits':>8} {'load s':>7} {'upsert us':>10} {'tz us':>7} {'fired/day':>10} {'day cpu s':>10} {'us/fire':>8} {'MB':>6}")
+    for count in args.habits:
+        r = run(count, args.batch_size)
+        print(f"{count:>8} {r['load_s']:>7.2f} {r['upsert_us']:>10.1f} {r['tz_change_us']:>7.1f} "
+              f"{r['fired']:>10} {r['day_cpu_s']:>10.2f} {r['fire_us']:>8.1f} {r['memory_mb']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
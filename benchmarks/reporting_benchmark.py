@@ -0,0 +1,122 @@
+"""Pure-Python loops vs the NumPy reports in backend/reporting.py.
+
+Builds synthetic habits with a year of bitmask history, then times the daily
+heatmap, per-weekday rates and cohort retention both ways (checking that they
+agree). Decoding into the matrix is timed separately from the reports.
+
+    python benchmarks/reporting_benchmark.py [--habits 1000 10000 50000] [--days 365]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from completions import completed_days, encode_dates
+from reporting import build_matrix, cohort_retention, daily_counts, weekday_rates
+
+
+def synthetic_habits(count, days, seed=42):
+    rng = random.Random(seed)
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    habits = []
+    for i in range(count):
+        created = start + timedelta(days=rng.randrange(days))
+        # Engagement decays after signup, so retention curves are not flat
+        rate, decay = rng.uniform(0.3, 0.9), rng.uniform(0.9, 1.0)
+        history = []
+        day, p = created, rate
+        while day <= end:
+            if rng.random() < p:
+                history.append(day)
+            day += timedelta(days=1)
+            p *= decay ** (1 / 7)
+        habits.append({
+            "user_id": f"user-{i // 3}",
+            "created_at": datetime.combine(created, datetime.min.time()),
+            "completions": encode_dates(history),
+        })
+    return habits, start, end
+
+
+def python_reports(habits, start, end, weeks=12):
+    days = (end - start).days + 1
+    counts = [0] * days
+    done_by_weekday = [0] * 7
+    possible_by_weekday = [0] * 7
+    first_seen = {}
+    user_days = defaultdict(set)
+    for habit in habits:
+        created = habit["created_at"].date()
+        for day in completed_days(habit, start, end):
+            offset = (day - start).days
+            counts[offset] += 1
+            done_by_weekday[day.weekday()] += 1
+            user_days[habit["user_id"]].add(offset)
+        for offset in range(max((created - start).days, 0), days):
+            possible_by_weekday[(start + timedelta(days=offset)).weekday()] += 1
+        user = habit["user_id"]
+        first_seen[user] = min(first_seen.get(user, created), created)
+
+    rates = [done / possible if possible else 0.0 for done, possible in zip(done_by_weekday, possible_by_weekday)]
+
+    cohorts = defaultdict(lambda: {"users": 0, "seen": [0] * weeks, "retained": [0] * weeks})
+    for user, first in first_seen.items():
+        cohort = cohorts[first.strftime("%Y-%m")]
+        cohort["users"] += 1
+        first_offset = (first - start).days
+        active = {(offset - first_offset) // 7 for offset in user_days[user]}
+        for week in range(weeks):
+            week_start = first_offset + 7 * week
+            if 0 <= week_start < days:
+                cohort["seen"][week] += 1
+                cohort["retained"][week] += week in active
+    retention = {
+        key: [r / s if s else 0.0 for r, s in zip(c["retained"], c["seen"])]
+        for key, c in sorted(cohorts.items())
+    }
+    return counts, rates, retention
+
+
+def numpy_reports(habits, start, end, weeks=12):
+    report = build_matrix(habits, start, end)
+    return daily_counts(report), weekday_rates(report), cohort_retention(report, weeks)
+
+
+def timed(fn, *args):
+    began = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - began) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--habits", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--weeks", type=int, default=12)
+    args = parser.parse_args()
+
+    print(f"{'habits':>7} {'python ms':>10} {'numpy ms':>9} {'decode ms':>10} {'speedup':>8}")
+    for count in args.habits:
+        habits, start, end = synthetic_habits(count, args.days)
+        (counts, rates, retention), python_ms = timed(python_reports, habits, start, end, args.weeks)
+        (np_counts, np_rates, np_retention), numpy_ms = timed(numpy_reports, habits, start, end, args.weeks)
+        report, decode_ms = timed(build_matrix, habits, start, end)
+
+        assert np_counts.tolist() == counts
+        assert np.allclose(np_rates, rates)
+        assert {c["cohort"]: c["retention"] for c in np_retention["cohorts"]} == {
+            key: [round(r, 4) for r in rates] for key, rates in retention.items()
+        }
+        print(f"{count:>7} {python_ms:>10.1f} {numpy_ms:>9.1f} {decode_ms:>10.1f} {python_ms / numpy_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
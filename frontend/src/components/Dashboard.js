@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { habitsAPI } from '../services/api';
+import { habitsAPI, openEvents } from '../services/api';
 import AddHabitModal from './AddHabitModal';
 import ProgressSection from './ProgressSection';
 import MotivationSection from './MotivationSection';
@@ -21,20 +21,65 @@ const Dashboard = ({ setIsAuthenticated }) => {
       setUser(JSON.parse(userData));
     }
     fetchData();
+    // Changes made on other devices arrive as deltas; a resync re-reads everything
+    return openEvents(applyEvent, () => fetchData(false));
   }, []);
 
-  const fetchData = async () => {
+  const applyDashboard = (data) => {
+    setHabits(data.habits);
+    setCompletedHabits({ completed: data.completed, pending: data.pending });
+    setProgress(data.progress);
+  };
+
+  const progressOf = ({ completed, pending }) => {
+    const total = completed.length + pending.length;
+    return {
+      total_habits: total,
+      completed_today: completed.length,
+      progress_percentage: total > 0 ? (completed.length / total) * 100 : 0,
+    };
+  };
+
+  // Events echo this device's own writes too, so applying one twice must be a no-op
+  const applyEvent = (event) => {
+    if (event.type === 'resync') {
+      fetchData(false);
+      return;
+    }
+    if (event.type === 'habits.created') {
+      setHabits((prev) => {
+        const known = new Set(prev.map((habit) => habit.id));
+        const added = event.habits
+          .filter((habit) => !known.has(habit.id))
+          .map(({ due, ...habit }) => habit);
+        return added.length ? [...prev, ...added] : prev;
+      });
+    }
+    setCompletedHabits((prev) => {
+      const listed = new Set([...prev.completed, ...prev.pending].map((habit) => habit.id));
+      let next = prev;
+      if (event.type === 'habits.created') {
+        const due = event.habits
+          .filter((habit) => habit.due && !listed.has(habit.id))
+          .map(({ id, name, time, days }) => ({ id, name, time, days }));
+        next = { ...prev, pending: [...prev.pending, ...due] };
+      } else if (event.type === 'habits.completed') {
+        const ids = new Set(event.habit_ids);
+        next = {
+          completed: [...prev.completed, ...prev.pending.filter((habit) => ids.has(habit.id))],
+          pending: prev.pending.filter((habit) => !ids.has(habit.id)),
+        };
+      }
+      setProgress(progressOf(next));
+      return next;
+    });
+  };
+
+  const fetchData = async (showLoading = true) => {
     try {
-      setLoading(true);
-      const [habitsRes, completedRes, progressRes] = await Promise.all([
-        habitsAPI.getHabits(),
-        habitsAPI.getCompletedHabits(),
-        habitsAPI.getProgress()
-      ]);
-      
-      setHabits(habitsRes.data);
-      setCompletedHabits(completedRes.data);
-      setProgress(progressRes.data);
+      setLoading(showLoading);
+      const { data } = await habitsAPI.getDashboard();
+      applyDashboard(data);
     } catch (error) {
       console.error('Error fetching data:', error);
     } finally {
@@ -44,8 +89,8 @@ const Dashboard = ({ setIsAuthenticated }) => {
 
   const handleAddHabit = async (habitData) => {
     try {
-      await habitsAPI.createHabit(habitData);
-      await fetchData(); // Refresh data
+      const { data } = await habitsAPI.createHabits([habitData]);
+      applyDashboard(data.dashboard);
       setShowAddModal(false);
     } catch (error) {
       console.error('Error adding habit:', error);
@@ -54,8 +99,8 @@ const Dashboard = ({ setIsAuthenticated }) => {
 
   const handleCompleteHabit = async (habitId) => {
     try {
-      await habitsAPI.completeHabit(habitId);
-      await fetchData(); // Refresh data
+      const { data } = await habitsAPI.completeHabits([habitId]);
+      applyDashboard(data.dashboard);
     } catch (error) {
       console.error('Error completing habit:', error);
     }
@@ -63,6 +108,7 @@ const Dashboard = ({ setIsAuthenticated }) => {
 
   const handleLogout = () => {
     localStorage.removeItem('token');
+    localStorage.removeItem('refreshToken');
     localStorage.removeItem('user');
     setIsAuthenticated(false);
     navigate('/');
@@ -25,10 +25,11 @@ const Login = ({ setIsAuthenticated }) => {
 
     try {
       const response = await authAPI.login(formData);
-      const { access_token, user } = response.data;
+      const { access_token, refresh_token, user } = response.data;
       
-      // Store token and user data
+      // Store tokens and user data
       localStorage.setItem('token', access_token);
+      localStorage.setItem('refreshToken', refresh_token);
       localStorage.setItem('user', JSON.stringify(user));
       
       setIsAuthenticated(true);
@@ -19,12 +19,46 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Renew the session with the refresh token once, then send the user to login
+let refreshing = null;
+
+const refreshSession = () => {
+  if (!refreshing) {
+    const refreshToken = localStorage.getItem('refreshToken');
+    refreshing = (refreshToken
+      ? axios.post(`${API_BASE_URL}/api/refresh`, { refresh_token: refreshToken })
+      : Promise.reject(new Error('No refresh token'))
+    )
+      .then(({ data }) => {
+        localStorage.setItem('token', data.access_token);
+        localStorage.setItem('refreshToken', data.refresh_token);
+        return data.access_token;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
 // Handle auth errors
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    if (error.response?.status === 401 && original && !original._retried && !original.url.endsWith('/api/login')) {
+      original._retried = true;
+      try {
+        const token = await refreshSession();
+        original.headers.Authorization = `Bearer ${token}`;
+        return api(original);
+      } catch (refreshError) {
+        // fall through to logout
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem('token');
+      localStorage.removeItem('refreshToken');
       localStorage.removeItem('user');
       window.location.href = '/login';
     }
@@ -34,17 +68,109 @@ api.interceptors.response.use(
 
 // Auth API
 export const authAPI = {
-  register: (userData) => api.post('/api/register', userData),
+  register: (userData) => api.post('/api/register', {
+    ...userData,
+    timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
+  }),
   login: (credentials) => api.post('/api/login', credentials),
 };
 
 // Habits API
 export const habitsAPI = {
+  getDashboard: () => api.get('/api/dashboard'),
   getHabits: () => api.get('/api/habits'),
   createHabit: (habitData) => api.post('/api/habits', habitData),
+  createHabits: (habits) => api.post('/api/habits:batch', { habits }),
   completeHabit: (habitId) => api.post('/api/complete-habit', { habit_id: habitId }),
+  completeHabits: (habitIds) => api.post('/api/complete-habits:batch', { habit_ids: habitIds }),
   getCompletedHabits: () => api.get('/api/completed-habits'),
   getProgress: () => api.get('/api/progress'),
 };
 
-export default api;
\ No newline at end of file
+// Dashboard push events (Server-Sent Events); EventSource cannot send headers, so the token rides in the URL.
+// When the browser gives up on the stream, a plain request for it tells why: an expired token (401) is
+// renewed and the stream reopened, backing off while it keeps failing; any other refusal, such as the
+// 404 of a deployment without an event stream, ends it. Builds with REACT_APP_EVENTS=false never open it.
+const EVENTS_ENABLED = process.env.REACT_APP_EVENTS !== 'false';
+const EVENT_TYPES = ['habits.created', 'habits.completed', 'resync'];
+const MAX_EVENTS_RETRY_MS = 60000;
+
+// Status of a request for the stream (0 if it failed), dropping the body as soon as the headers arrive
+const probeEvents = (url) => {
+  const controller = new AbortController();
+  return fetch(url, { headers: { Accept: 'text/event-stream' }, signal: controller.signal })
+    .then((response) => {
+      controller.abort();
+      return response.status;
+    })
+    .catch(() => 0);
+};
+
+export const openEvents = (onEvent, onReconnect) => {
+  if (!EVENTS_ENABLED || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+  let source = null;
+  let timer = null;
+  let stopped = false;
+  let opened = false;
+  let retryMs = 1000;
+
+  const retry = () => {
+    if (!stopped) {
+      timer = setTimeout(connect, retryMs);
+      retryMs = Math.min(retryMs * 2, MAX_EVENTS_RETRY_MS);
+    }
+  };
+
+  const connect = () => {
+    const token = localStorage.getItem('token');
+    if (stopped || !token) {
+      return;
+    }
+    const url = `${API_BASE_URL}/api/events?token=${encodeURIComponent(token)}`;
+    source = new EventSource(url);
+    source.onopen = () => {
+      // Events may have been missed while the stream was down
+      if (opened) {
+        onReconnect();
+      }
+      opened = true;
+      retryMs = 1000;
+    };
+    source.onerror = () => {
+      // While CONNECTING the browser retries on its own; CLOSED means it has given up
+      if (source.readyState !== EventSource.CLOSED) {
+        return;
+      }
+      source.close();
+      probeEvents(url).then((status) => {
+        if (stopped) {
+          return;
+        }
+        if (status === 401) {
+          refreshSession()
+            .then(retry)
+            .catch(() => {
+              // Session is over; the next API call sends the user to login
+            });
+        } else if (status < 400 || status === 429 || status >= 500) {
+          retry();
+        }
+        // Any other refusal (404 where no stream is served) will not change on retry
+      });
+    };
+    EVENT_TYPES.forEach((type) => {
+      source.addEventListener(type, (message) => onEvent(JSON.parse(message.data)));
+    });
+  };
+
+  connect();
+  return () => {
+    stopped = true;
+    clearTimeout(timer);
+    if (source) {
+      source.close();
+    }
+  };
+};